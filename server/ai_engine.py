@@ -10,12 +10,30 @@ File: server/ai_engine.py
 """
 
 import os
+import re
 import json
 import logging
 import hashlib
-from typing import Dict, Any, Optional, List
-from openai import OpenAI
+import sqlite3
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, Tuple
+import httpx
+import numpy as np
+import openai
+from openai import OpenAI, AsyncOpenAI
 from dotenv import load_dotenv
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    stop_before_delay,
+    wait_exponential_jitter,
+)
 import time
 
 # Core scoring
@@ -24,11 +42,12 @@ from scoring_engine import (
     generate_optimization_plan,
     transform_to_legacy_format,
     generate_evaluation,
+    format_evaluation,
     EvaluationResult
 )
 
 # Modular analyzers
-from analyzers.resume_quality import analyze_resume_quality, format_quality_report
+from analyzers.resume_quality import analyze_resume_quality, format_quality_report, clear_quality_cache
 from analyzers.interview_prep import generate_interview_questions, format_interview_prep
 from analyzers.cover_letter import (
     generate_cover_letter, 
@@ -37,120 +56,780 @@ from analyzers.cover_letter import (
     ToneStyle
 )
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+# Maps the API's cover letter tone string to the enum
+TONE_MAP = {
+    "professional": ToneStyle.PROFESSIONAL,
+    "confident": ToneStyle.CONFIDENT,
+    "conversational": ToneStyle.CONVERSATIONAL,
+    "executive": ToneStyle.EXECUTIVE,
+}
+
+# Configure logging (leave it alone if the host app or gunicorn already did)
+if not logging.getLogger().handlers:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
-# Load environment variables
+# Load environment variables (never overrides values already in the environment)
 load_dotenv()
 
-# Initialize OpenAI client
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# orjson is an optional, faster drop-in for the JSON this module reads/writes
+try:
+    import orjson
+    _json_loads = orjson.loads
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
+# Per-request timeout so a hung connection can't block a worker indefinitely
+OPENAI_TIMEOUT_SECONDS = 30
+
+# The semantic cache's embedding call is a single attempt with a shorter timeout
+EMBEDDING_TIMEOUT_SECONDS = 10
+
+# Wall-clock budget for all OpenAI calls in one analysis, kept below the
+# gunicorn worker --timeout (120s) so the caller gets an error response
+# instead of a killed worker. An analysis makes one embedding call and up to
+# two retry cycles (the invalid-JSON fallback model), and the last attempt of
+# a cycle may start just inside the retry window and then run a full timeout.
+OPENAI_TOTAL_BUDGET_SECONDS = 100
+OPENAI_RETRY_WINDOW_SECONDS = (
+    (OPENAI_TOTAL_BUDGET_SECONDS - EMBEDDING_TIMEOUT_SECONDS) / 2 - OPENAI_TIMEOUT_SECONDS
+)
+
+def _create_http_client() -> httpx.Client:
+    """
+    Build the pooled HTTP client shared by every OpenAI call in this process.
+    
+    Keep-alive connections skip the TCP/TLS handshake on repeat calls. HTTP/2
+    is used when the optional `h2` package is installed.
+    """
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+    
+    return httpx.Client(
+        http2=http2,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        timeout=OPENAI_TIMEOUT_SECONDS,
+    )
+
+# Initialize OpenAI clients (retries are handled by _openai_retry below).
+# Created at import, so each gunicorn worker builds its own pool; don't share
+# one across a fork (--preload), since the sockets would be shared too.
+client = OpenAI(
+    api_key=os.getenv("OPENAI_API_KEY"),
+    max_retries=0,
+    http_client=_create_http_client(),
+)
+aclient = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0)
+
+# ═══════════════════════════════════════════════════════════════════════════
+# MODEL ROUTING
+# ═══════════════════════════════════════════════════════════════════════════
+
+# Short inputs with a clearly bulleted requirements block are simple enough
+# for the cheaper, faster model. Set OPENAI_MODEL_MINI= (empty) to disable.
+OPENAI_MODEL_MINI = os.getenv("OPENAI_MODEL_MINI", "gpt-4o-mini")
+MINI_MODEL_MAX_CHARS = 6000
+
+# Stronger model retried once when the primary returns unparseable JSON.
+# Set OPENAI_MODEL_FALLBACK= (empty) to disable.
+OPENAI_MODEL_FALLBACK = os.getenv("OPENAI_MODEL_FALLBACK", "gpt-4o")
+
+_REQUIREMENTS_BLOCK_RE = re.compile(
+    r"^[ \t]*(?:requirements?|required skills|qualifications|must have)[ \t]*:?[ \t]*\n"
+    r"(?P<bullets>(?:[ \t]*[-*•][ \t]*\S.*(?:\n|$)){3,})",
+    re.IGNORECASE | re.MULTILINE,
+)
+_BULLET_ITEM_RE = re.compile(r"^[ \t]*[-*•][ \t]*(.+?)[ \t]*$", re.MULTILINE)
+MAX_PREEXTRACTED_SKILLS = 25
+
+def extract_required_skills(job_text: str) -> List[str]:
+    """
+    Pull the bulleted requirements list out of a job description.
+    
+    Most postings have a "Requirements:" block of bullets; handing that list
+    to the model means it doesn't have to re-derive it from the full text.
+    Returns an empty list when there is no clean bulleted block.
+    """
+    match = _REQUIREMENTS_BLOCK_RE.search(job_text)
+    if not match:
+        return []
+    items = _BULLET_ITEM_RE.findall(match.group("bullets"))
+    return items[:MAX_PREEXTRACTED_SKILLS]
+
+def pick_model(resume_text: str, job_text: str) -> str:
+    """Choose the model tier for an extraction call."""
+    primary = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    if (
+        OPENAI_MODEL_MINI
+        and len(resume_text) + len(job_text) < MINI_MODEL_MAX_CHARS
+        and _REQUIREMENTS_BLOCK_RE.search(job_text)
+    ):
+        model = OPENAI_MODEL_MINI
+    else:
+        model = primary
+    logger.info("Model tier: %s", model)
+    return model
+
+# ═══════════════════════════════════════════════════════════════════════════
+# LEXICAL PRE-SCORE
+# ═══════════════════════════════════════════════════════════════════════════
+
+# If almost none of the job's vocabulary appears in the resume, the match is
+# clearly poor and the AI call can be skipped. Off by default: a strong resume
+# and a posting in different languages (EN/ES) share almost no vocabulary, so
+# only set AI_PRESCORE_FLOOR (e.g. 0.05) where both are in the same language.
+PRESCORE_FLOOR = float(os.getenv("AI_PRESCORE_FLOOR", "0"))
+PRESCORE_MIN_JOB_TOKENS = 30
+
+# Words starting with a letter (any script), keeping inner "+#.-" as in c++,
+# c#, node.js and front-end, but not trailing sentence punctuation
+_TOKEN_RE = re.compile(r"[^\W\d_][\w+#.-]*[\w+#]")
+_STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has",
+    "have", "in", "is", "it", "of", "on", "or", "our", "that", "the", "their",
+    "this", "to", "we", "will", "with", "you", "your", "who", "what", "can",
+    "de", "la", "el", "en", "y", "los", "las", "del", "con", "para", "por",
+    "un", "una", "que", "se", "es", "al", "su", "sus",
+})
+
+def _tokenize(text: str) -> set:
+    """Lowercase word tokens, minus stopwords."""
+    return set(_TOKEN_RE.findall(text.lower())) - _STOPWORDS
+
+def prescore(resume_text: str, job_text: str) -> float:
+    """Fraction of the job description's distinct tokens found in the resume."""
+    return _overlap(_tokenize(job_text), resume_text)
+
+def _overlap(job_tokens: set, resume_text: str) -> float:
+    """prescore() with the job description already tokenized."""
+    if not job_tokens:
+        return 1.0
+    return len(job_tokens & _tokenize(resume_text)) / len(job_tokens)
+
+def _should_skip_extraction(resume_text: str, job_text: str) -> bool:
+    """True when the lexical overlap is too low to be worth an AI call."""
+    if PRESCORE_FLOOR <= 0:
+        return False
+    job_tokens = _tokenize(job_text)
+    if len(job_tokens) < PRESCORE_MIN_JOB_TOKENS:
+        return False
+    # Without a requirements block the synthesized result would list no
+    # requirements at all, so let the AI read the posting instead
+    if not extract_required_skills(job_text):
+        return False
+    overlap = _overlap(job_tokens, resume_text)
+    if overlap < PRESCORE_FLOOR:
+        logger.info("Pre-score %.3f below floor %s, skipping AI extraction", overlap, PRESCORE_FLOOR)
+        return True
+    return False
+
+def _no_match_extraction(job_text: str) -> Dict[str, Any]:
+    """Synthesize an extraction where every bulleted requirement is unmatched."""
+    requirements = [
+        {"text": skill, "tier": 1, "match_type": "NONE", "evidence": ""}
+        for skill in extract_required_skills(job_text)
+    ]
+    return {
+        "requirements": requirements,
+        "experience": {"required_years": 0, "candidate_years": 0, "seniority_signals": []},
+        "gaps": [
+            {"requirement": req["text"], "suggestion": f"Add evidence of {req['text']}"}
+            for req in requirements
+        ],
+        "job_title": "",
+        "company_name": "",
+        "summary": "The resume shares almost no vocabulary with this job description, "
+                   "so it is unlikely to be a match.",
+    }
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# INPUT TOKEN BUDGET
+# ═══════════════════════════════════════════════════════════════════════════
+
+# Caps keep cost and latency bounded for very long resumes or postings
+MAX_RESUME_TOKENS = 4000
+MAX_JOB_TOKENS = 2500
+CHARS_PER_TOKEN = 4  # Rough estimate used when tiktoken isn't installed
+
+_encoder = None
+_encoder_loaded = False
+_encoder_lock = threading.Lock()
+
+def _get_encoder():
+    """Load the tiktoken encoder once; None if tiktoken isn't available."""
+    global _encoder, _encoder_loaded
+    if not _encoder_loaded:
+        # Request threads and the analyzer pool can all arrive here first
+        with _encoder_lock:
+            if not _encoder_loaded:
+                try:
+                    import tiktoken
+                    _encoder = tiktoken.get_encoding("o200k_base")
+                except ImportError:
+                    logger.info("tiktoken not installed, estimating token counts from characters")
+                _encoder_loaded = True
+    return _encoder
+
+def clip_to_tokens(text: str, max_tokens: int, label: str = "text") -> str:
+    """
+    Truncate text to at most max_tokens tokens.
+    
+    Args:
+        text: Text to clip
+        max_tokens: Token budget
+        label: Name used in the truncation log message
+        
+    Returns:
+        The original text, or its leading max_tokens tokens
+    """
+    encoder = _get_encoder()
+    if encoder is None:
+        max_chars = max_tokens * CHARS_PER_TOKEN
+        if len(text) <= max_chars:
+            return text
+        clipped = text[:max_chars]
+    else:
+        token_ids = encoder.encode(text)
+        if len(token_ids) <= max_tokens:
+            return text
+        clipped = encoder.decode(token_ids[:max_tokens])
+    
+    logger.info("Truncated %s from %s to %s characters", label, len(text), len(clipped))
+    return clipped
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# RETRIES FOR TRANSIENT API FAILURES
+# ═══════════════════════════════════════════════════════════════════════════
+
+# Rate limits, timeouts, dropped connections and 5xx usually succeed on retry.
+# Anything else (bad request, auth) fails immediately.
+_TRANSIENT_OPENAI_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,  # Includes APITimeoutError
+    openai.InternalServerError,
+)
+
+def _log_retry(retry_state) -> None:
+    """Log each retry with the attempt number and triggering error."""
+    logger.warning(
+        "OpenAI call failed (attempt %s): %s. Retrying...",
+        retry_state.attempt_number,
+        retry_state.outcome.exception(),
+    )
+
+_openai_retry = retry(
+    # stop_before_delay also gives up when the next backoff would end past the window
+    stop=stop_after_attempt(5) | stop_before_delay(OPENAI_RETRY_WINDOW_SECONDS),
+    wait=wait_exponential_jitter(initial=1, max=30),
+    retry=retry_if_exception_type(_TRANSIENT_OPENAI_ERRORS),
+    before_sleep=_log_retry,
+    reraise=True,
+)
+
+def _log_usage(usage) -> None:
+    """Log token usage, including prompt tokens served from OpenAI's cache."""
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached_tokens = getattr(details, "cached_tokens", 0) or 0
+    logger.info(
+        "OpenAI usage: %s prompt (%s cached), %s completion tokens",
+        usage.prompt_tokens,
+        cached_tokens,
+        usage.completion_tokens,
+    )
+
+def _append_chunk(parts: List[str], chunk) -> None:
+    """Collect one streamed chunk's text (the final chunk only carries usage)."""
+    if chunk.choices:
+        choice = chunk.choices[0]
+        parts.append(choice.delta.content or "")
+        if getattr(choice, "finish_reason", None) == "length":
+            logger.warning("OpenAI response hit max_tokens and was truncated")
+    if getattr(chunk, "usage", None):
+        _log_usage(chunk.usage)
+
+@_openai_retry
+def _create_completion(**kwargs: Any) -> str:
+    """
+    Stream a chat completion and return its full text content.
+    
+    Streaming starts receiving tokens as soon as they're generated instead of
+    waiting on one large response; a dropped stream is retried as a whole.
+    """
+    parts: List[str] = []
+    with client.chat.completions.create(
+        timeout=OPENAI_TIMEOUT_SECONDS,
+        stream=True,
+        stream_options={"include_usage": True},
+        **kwargs,
+    ) as stream:
+        for chunk in stream:
+            _append_chunk(parts, chunk)
+    return "".join(parts)
+
+@_openai_retry
+async def _create_completion_async(openai_client: AsyncOpenAI, **kwargs: Any) -> str:
+    """Async variant of _create_completion()."""
+    parts: List[str] = []
+    async with await openai_client.chat.completions.create(
+        timeout=OPENAI_TIMEOUT_SECONDS,
+        stream=True,
+        stream_options={"include_usage": True},
+        **kwargs,
+    ) as stream:
+        async for chunk in stream:
+            _append_chunk(parts, chunk)
+    return "".join(parts)
 
 # ═══════════════════════════════════════════════════════════════════════════
 # CACHING FOR CONSISTENCY
 # ═══════════════════════════════════════════════════════════════════════════
 
-# In-memory cache for extraction results (same input = same output)
-_extraction_cache: Dict[str, Dict[str, Any]] = {}
+# In-memory LRU cache for extraction results (same input = same output).
+# Locked because Flask/gunicorn threads and the batch helper share it.
+EXTRACTION_CACHE_MAX_ENTRIES = 256
+_extraction_cache: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+_cache_lock = threading.RLock()
+
+# Optional persistent cache so repeat analyses survive restarts. Off by default
+# because cached extractions quote resume evidence and we don't store user data.
+AI_CACHE_ENABLED = os.getenv("AI_CACHE_ENABLED", "false").lower() == "true"
+AI_CACHE_PATH = os.getenv(
+    "AI_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".ai_cache.sqlite3"),
+)
+# Cached extractions older than this are re-extracted (0 = never expire)
+AI_CACHE_TTL_SECONDS = int(os.getenv("AI_CACHE_TTL_SECONDS", "86400"))
+
+def _get_cache_key(resume_text: str, job_text: str, model: str) -> str:
+    """Generate a cache key from the prompt, model, resume and job text."""
+    # Feed the hasher piecewise rather than building one concatenated copy
+    hasher = hashlib.blake2b(EXTRACTION_PROMPT.encode(), digest_size=16)
+    for part in (model, resume_text.strip(), job_text.strip()):
+        hasher.update(b"|||")
+        hasher.update(part.encode())
+    return hasher.hexdigest()
 
-def _get_cache_key(resume_text: str, job_text: str) -> str:
-    """Generate a cache key from resume and job text."""
-    combined = f"{resume_text.strip()}|||{job_text.strip()}"
-    return hashlib.sha256(combined.encode()).hexdigest()
+def _connect_persistent_cache() -> sqlite3.Connection:
+    """Open the persistent cache database, creating the table on first use."""
+    conn = sqlite3.connect(AI_CACHE_PATH, timeout=5)
+    conn.execute("PRAGMA journal_mode=WAL")  # Readers don't block other workers' writes
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS extractions ("
+        "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS semantic_index ("
+        "key TEXT PRIMARY KEY, namespace TEXT NOT NULL, embedding BLOB NOT NULL)"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS embeddings ("
+        "key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+    )
+    return conn
+
+def _is_fresh(result: Dict[str, Any]) -> bool:
+    """True if a cached extraction is within AI_CACHE_TTL_SECONDS."""
+    if AI_CACHE_TTL_SECONDS <= 0:
+        return True
+    return time.time() - result.get("_cached_at", 0) < AI_CACHE_TTL_SECONDS
 
 def _get_cached_extraction(cache_key: str) -> Optional[Dict[str, Any]]:
     """Get cached extraction result if available."""
-    return _extraction_cache.get(cache_key)
+    with _cache_lock:
+        cached = _extraction_cache.get(cache_key)
+        if cached is not None:
+            if _is_fresh(cached):
+                _extraction_cache.move_to_end(cache_key)
+                return cached
+            del _extraction_cache[cache_key]
+    if not AI_CACHE_ENABLED:
+        return None
+    
+    try:
+        with closing(_connect_persistent_cache()) as conn:
+            row = conn.execute(
+                "SELECT value FROM extractions WHERE key = ?", (cache_key,)
+            ).fetchone()
+    except sqlite3.Error as e:
+        logger.warning("Persistent cache read failed: %s", e)
+        return None
+    
+    if row is None:
+        return None
+    cached = _json_loads(row[0])
+    if not _is_fresh(cached):
+        return None
+    _remember_extraction(cache_key, cached)  # Promote to memory
+    return cached
+
+def _remember_extraction(cache_key: str, result: Dict[str, Any]) -> None:
+    """Insert into the in-memory LRU, evicting the least recently used entry."""
+    with _cache_lock:
+        _extraction_cache[cache_key] = result
+        _extraction_cache.move_to_end(cache_key)
+        if len(_extraction_cache) > EXTRACTION_CACHE_MAX_ENTRIES:
+            _extraction_cache.popitem(last=False)
 
 def _cache_extraction(cache_key: str, result: Dict[str, Any]) -> None:
-    """Cache extraction result. Limit cache size to prevent memory issues."""
-    if len(_extraction_cache) > 100:  # Simple LRU-ish behavior
-        # Remove oldest entries
-        keys_to_remove = list(_extraction_cache.keys())[:50]
-        for key in keys_to_remove:
-            del _extraction_cache[key]
-    _extraction_cache[cache_key] = result
+    """Cache extraction result in memory and, if enabled, on disk."""
+    # Keep the original stamp when re-caching (e.g. a semantic hit) so reuse
+    # doesn't extend an entry's lifetime
+    now = time.time()
+    result.setdefault("_cached_at", now)
+    _remember_extraction(cache_key, result)
+    
+    if AI_CACHE_ENABLED:
+        try:
+            with closing(_connect_persistent_cache()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO extractions (key, value, created_at) VALUES (?, ?, ?)",
+                    (cache_key, _json_dumps(result), result["_cached_at"]),
+                )
+                if AI_CACHE_TTL_SECONDS > 0:
+                    conn.execute(
+                        "DELETE FROM extractions WHERE created_at < ?",
+                        (now - AI_CACHE_TTL_SECONDS,),
+                    )
+        except sqlite3.Error as e:
+            logger.warning("Persistent cache write failed: %s", e)
+
+# Single-flight: concurrent requests for the same cache key share one OpenAI
+# call instead of each paying for it before the first result is cached
+_inflight: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+def _claim_inflight(cache_key: str) -> Tuple[bool, Future]:
+    """Return (is_owner, future). The owner must run the call and resolve it."""
+    with _inflight_lock:
+        future = _inflight.get(cache_key)
+        if future is not None:
+            return False, future
+        future = Future()
+        _inflight[cache_key] = future
+        return True, future
+
+def _release_inflight(cache_key: str) -> None:
+    """Drop a resolved in-flight entry."""
+    with _inflight_lock:
+        _inflight.pop(cache_key, None)
 
 def clear_cache() -> None:
     """Clear the extraction cache (for testing)."""
-    _extraction_cache.clear()
+    with _cache_lock:
+        _extraction_cache.clear()
+        _embedding_cache.clear()
+        _semantic_index.clear()
+        _semantic_loaded.clear()
+    clear_quality_cache()
+    if AI_CACHE_ENABLED:
+        try:
+            with closing(_connect_persistent_cache()) as conn, conn:
+                conn.execute("DELETE FROM extractions")
+                conn.execute("DELETE FROM semantic_index")
+                conn.execute("DELETE FROM embeddings")
+        except sqlite3.Error as e:
+            logger.warning("Persistent cache clear failed: %s", e)
     logger.info("Extraction cache cleared")
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+# SEMANTIC CACHE (near-duplicate inputs)
+# ═══════════════════════════════════════════════════════════════════════════
+
+# Opt-in: a near-duplicate resume reuses the previous extraction, so a one-line
+# edit may not be reflected until the similarity drops below the threshold.
+AI_SEMANTIC_CACHE_ENABLED = os.getenv("AI_SEMANTIC_CACHE_ENABLED", "false").lower() == "true"
+AI_SEMANTIC_CACHE_THRESHOLD = float(os.getenv("AI_SEMANTIC_CACHE_THRESHOLD", "0.97"))
+AI_SEMANTIC_CACHE_MAX_ENTRIES = 1000
+EMBEDDING_MODEL = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
+
+# namespace -> (cache keys, row-normalized embedding matrix)
+_semantic_index: Dict[str, Tuple[List[str], np.ndarray]] = {}
+_semantic_loaded: set = set()
+
+def _semantic_namespace(model: str) -> str:
+    """Embeddings are only comparable for the same model and prompt."""
+    prompt_hash = hashlib.sha256(EXTRACTION_PROMPT.encode()).hexdigest()[:16]
+    return f"{model}:{prompt_hash}"
+
+# Embeddings by content hash, so identical input text is embedded only once
+# (e.g. the same pair routed to a different model, or after an eviction)
+# (LRU, guarded by _cache_lock like the extraction cache)
+_embedding_cache: OrderedDict[str, bytes] = OrderedDict()
+EMBEDDING_CACHE_MAX_ENTRIES = 500
+
+def _embedding_key(text: str) -> str:
+    """Content hash for an embedding input, scoped to the embedding model."""
+    return hashlib.blake2b(f"{EMBEDDING_MODEL}\n{text}".encode(), digest_size=16).hexdigest()
+
+def _get_cached_embedding(key: str) -> Optional[bytes]:
+    """Look up raw float32 embedding bytes in memory, then SQLite if enabled."""
+    with _cache_lock:
+        blob = _embedding_cache.get(key)
+        if blob is not None:
+            _embedding_cache.move_to_end(key)
+    if blob is not None or not AI_CACHE_ENABLED:
+        return blob
+    
+    try:
+        with closing(_connect_persistent_cache()) as conn:
+            row = conn.execute(
+                "SELECT vector FROM embeddings WHERE key = ?", (key,)
+            ).fetchone()
+    except sqlite3.Error as e:
+        logger.warning("Embedding cache read failed: %s", e)
+        return None
+    
+    if row is None:
+        return None
+    _remember_embedding(key, row[0])  # Promote to memory
+    return row[0]
+
+def _remember_embedding(key: str, blob: bytes) -> None:
+    """Add to the bounded in-memory embedding cache, evicting the oldest entry."""
+    with _cache_lock:
+        _embedding_cache[key] = blob
+        _embedding_cache.move_to_end(key)
+        if len(_embedding_cache) > EMBEDDING_CACHE_MAX_ENTRIES:
+            _embedding_cache.popitem(last=False)
+
+def _cache_embedding(key: str, blob: bytes) -> None:
+    """Store raw float32 embedding bytes (no pickling)."""
+    _remember_embedding(key, blob)
+    if AI_CACHE_ENABLED:
+        try:
+            with closing(_connect_persistent_cache()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                    (key, blob),
+                )
+        except sqlite3.Error as e:
+            logger.warning("Embedding cache write failed: %s", e)
+
+def _embed_analysis_input(resume_text: str, job_text: str) -> np.ndarray:
+    """Embed a resume/job pair as a unit-length float32 vector."""
+    text = f"{resume_text.strip()}\n###\n{job_text.strip()}"
+    key = _embedding_key(text)
+    
+    blob = _get_cached_embedding(key)
+    if blob is None:
+        response = client.embeddings.create(
+            model=EMBEDDING_MODEL, input=text, timeout=EMBEDDING_TIMEOUT_SECONDS
+        )
+        vector = np.asarray(response.data[0].embedding, dtype=np.float32)
+        blob = (vector / np.linalg.norm(vector)).tobytes()
+        _cache_embedding(key, blob)
+    
+    return np.frombuffer(blob, dtype=np.float32)
+
+def _load_semantic_index(namespace: str) -> None:
+    """Load persisted embeddings for a namespace on first use."""
+    # Held for the whole load so a concurrent _add_to_semantic_index can't
+    # append an entry that the load then overwrites
+    with _cache_lock:
+        if namespace in _semantic_loaded:
+            return
+        _semantic_loaded.add(namespace)
+        if not AI_CACHE_ENABLED:
+            return
+        
+        try:
+            with closing(_connect_persistent_cache()) as conn:
+                rows = conn.execute(
+                    "SELECT key, embedding FROM semantic_index WHERE namespace = ? "
+                    "ORDER BY rowid DESC LIMIT ?",
+                    (namespace, AI_SEMANTIC_CACHE_MAX_ENTRIES),
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning("Semantic index load failed: %s", e)
+            return
+        
+        if rows:
+            rows.reverse()
+            keys = [key for key, _ in rows]
+            vectors = np.stack([np.frombuffer(blob, dtype=np.float32) for _, blob in rows])
+            _semantic_index[namespace] = (keys, vectors)
+
+def semantic_lookup(
+    resume_text: str,
+    job_text: str,
+    model: str,
+) -> Tuple[Optional[Dict[str, Any]], Optional[np.ndarray]]:
+    """
+    Find a cached extraction for a near-duplicate resume/job pair.
+    
+    Returns:
+        Tuple of (cached extraction or None, query embedding or None).
+        The embedding is returned so a miss can be indexed without re-embedding.
+    """
+    namespace = _semantic_namespace(model)
+    try:
+        _load_semantic_index(namespace)
+        embedding = _embed_analysis_input(resume_text, job_text)
+    except Exception as e:
+        logger.warning("Semantic cache lookup skipped: %s", e)
+        return None, None
+    
+    keys, vectors = _semantic_index.get(namespace, ([], None))
+    if vectors is None:
+        return None, embedding
+    
+    similarities = vectors @ embedding
+    best = int(np.argmax(similarities))
+    if similarities[best] < AI_SEMANTIC_CACHE_THRESHOLD:
+        return None, embedding
+    
+    logger.info("Semantic cache hit (similarity %.3f)", similarities[best])
+    return _get_cached_extraction(keys[best]), embedding
+
+def _add_to_semantic_index(cache_key: str, embedding: np.ndarray, model: str) -> None:
+    """Index an embedding so future near-duplicates can reuse its extraction."""
+    namespace = _semantic_namespace(model)
+    with _cache_lock:
+        keys, vectors = _semantic_index.get(namespace, ([], None))
+        keys = keys + [cache_key]
+        vectors = embedding[np.newaxis, :] if vectors is None else np.vstack([vectors, embedding])
+        if len(keys) > AI_SEMANTIC_CACHE_MAX_ENTRIES:
+            keys = keys[-AI_SEMANTIC_CACHE_MAX_ENTRIES:]
+            vectors = vectors[-AI_SEMANTIC_CACHE_MAX_ENTRIES:]
+        _semantic_index[namespace] = (keys, vectors)
+    
+    if AI_CACHE_ENABLED:
+        try:
+            with closing(_connect_persistent_cache()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO semantic_index (key, namespace, embedding) VALUES (?, ?, ?)",
+                    (cache_key, namespace, embedding.astype(np.float32).tobytes()),
+                )
+        except sqlite3.Error as e:
+            logger.warning("Semantic index write failed: %s", e)
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # AI EXTRACTION PROMPT (extraction only - no scoring)
 # ═══════════════════════════════════════════════════════════════════════════
 
-EXTRACTION_PROMPT = """You are a DETERMINISTIC resume analysis engine. Extract and match keywords consistently.
-
-CRITICAL: Same input MUST produce identical output. When uncertain, use these tie-breakers:
-- If skill name appears anywhere in resume → EXACT or VARIANT (never NONE)
-- If related work is described → CONTEXTUAL (never NONE)
-- Only use NONE if absolutely no connection exists
-
-TASK 1: Parse job description requirements into tiers
-- TIER 1: Explicitly required ("Required", "Must have", "X+ years", mentioned 2+ times)
-- TIER 2: Preferred/important ("Preferred", "Nice to have", mentioned once)
-- TIER 3: Bonus items ("Plus", "a plus", secondary tools)
-
-TASK 2: For each requirement, find resume evidence (BE GENEROUS - favor matches)
-Match types (in order of preference):
-- EXACT: Term found verbatim OR common abbreviation (Python/Py, JavaScript/JS)
-- VARIANT: Recognized equivalent (React.js = ReactJS, AWS = Amazon Web Services)
-- CONTEXTUAL: Skill is demonstrated through described work (cite specific evidence)
-- NONE: Absolutely no evidence in resume (use sparingly)
-
-MATCHING GUIDANCE:
-- "Communication skills" → Match if ANY client/team interaction described
-- "Technical understanding" → Match if ANY technical work described
-- "Problem solving" → Match if ANY achievement/improvement described
-- Soft skills → Almost always CONTEXTUAL if person held relevant job
-- Years experience → Calculate from employment dates, round UP
-
-TASK 3: Extract experience data
-- required_years: From job description (e.g., "3+ years" → 3)
-- candidate_years: From resume dates (round UP partial years)
-- seniority_signals: Leadership, mentoring, "led", "managed", "senior"
-
-TASK 4: Identify gaps (only for TRUE NONE matches)
-Provide specific, actionable suggestions.
-
-OUTPUT FORMAT (JSON only):
-{
-  "requirements": [
-    {"text": "skill name", "tier": 1, "match_type": "EXACT", "evidence": "quote from resume"}
-  ],
-  "experience": {
-    "required_years": 3,
-    "candidate_years": 5,
-    "seniority_signals": ["Led team of 3"]
-  },
-  "gaps": [
-    {"requirement": "Missing Skill", "suggestion": "Add X experience"}
-  ],
-  "job_title": "extracted title",
-  "company_name": "company if mentioned",
-  "summary": "2-3 sentence assessment"
-}
+EXTRACTION_PROMPT = """You are a DETERMINISTIC resume analysis engine. Same input MUST give identical output.
 
-RULES:
-1. BE CONSISTENT - same resume+job = same classification every time
-2. FAVOR MATCHES over NONE when evidence is ambiguous
-3. Extract ALL requirements from job description
-4. Always cite evidence for CONTEXTUAL matches
-"""
+TASK 1: List ALL job requirements by tier
+- 1: required ("Required", "Must have", "X+ years", mentioned 2+ times)
+- 2: preferred ("Preferred", "Nice to have", mentioned once)
+- 3: bonus ("a plus", secondary tools)
+- If PRE-EXTRACTED REQUIREMENTS are given, start from them (split lines naming several skills) and add any missed
 
-USER_PROMPT_TEMPLATE = """
-RESUME TEXT:
-"{resume_text}"
+TASK 2: Match each requirement to the resume. FAVOR MATCHES when ambiguous:
+- EXACT: verbatim or common abbreviation (JavaScript/JS)
+- VARIANT: recognized equivalent (AWS = Amazon Web Services)
+- CONTEXTUAL: demonstrated by described work; cite it. Soft skills are CONTEXTUAL if any related
+  work is described (client/team interaction, technical work, achievements)
+- NONE: no connection at all. A skill named anywhere in the resume is never NONE
 
-JOB DESCRIPTION:
-"{job_text}"
+TASK 3: Experience: required_years from the job; candidate_years from resume dates (round UP);
+seniority_signals such as led, managed, mentored, senior
 
-Extract requirements, match them to the resume, and identify gaps. Return JSON only.
+TASK 4: Gaps, only for NONE matches, each with a specific actionable suggestion
+
+Return JSON only:
+{"requirements": [{"text": "skill", "tier": 1, "match_type": "EXACT", "evidence": "resume quote"}],
+ "experience": {"required_years": 3, "candidate_years": 5, "seniority_signals": ["Led team of 3"]},
+ "gaps": [{"requirement": "skill", "suggestion": "Add X experience"}],
+ "job_title": "title", "company_name": "company if mentioned", "summary": "2-3 sentence assessment"}
 """
 
+# One short worked example so smaller models follow the schema and matching
+# rules. Static, so it is part of the cached prompt prefix.
+FEW_SHOT_MESSAGES = [
+    {"role": "user", "content": (
+        'RESUME TEXT:\n"Support Engineer, 2019-2023. Built Python scripts to automate '
+        'ticket triage. Trained 4 new hires."\n\n'
+        'JOB DESCRIPTION:\n"Requirements: 3+ years Python. Mentoring. Kubernetes is a plus."\n\n'
+        "Extract requirements, match them to the resume, and identify gaps. Return JSON only."
+    )},
+    {"role": "assistant", "content": (
+        '{"requirements": ['
+        '{"text": "Python", "tier": 1, "match_type": "EXACT", "evidence": "Built Python scripts"}, '
+        '{"text": "Mentoring", "tier": 1, "match_type": "CONTEXTUAL", "evidence": "Trained 4 new hires"}, '
+        '{"text": "Kubernetes", "tier": 3, "match_type": "NONE", "evidence": ""}], '
+        '"experience": {"required_years": 3, "candidate_years": 4, "seniority_signals": ["Trained 4 new hires"]}, '
+        '"gaps": [{"requirement": "Kubernetes", "suggestion": "Add any container or deployment work"}], '
+        '"job_title": "", "company_name": "", '
+        '"summary": "Strong Python and mentoring match; only the bonus Kubernetes skill is missing."}'
+    )},
+]
+
+# Routes requests to OpenAI's server-side prompt cache. EXTRACTION_PROMPT must
+# stay byte-identical and first in the message list (all per-request text goes
+# in the user message). Bump the version whenever EXTRACTION_PROMPT or
+# FEW_SHOT_MESSAGES change.
+PROMPT_CACHE_KEY = "resume_extraction_v3"
+
+# User prompt pieces, joined around the (often long) resume and job text in
+# one pass instead of running str.format over the whole prompt
+_USER_PROMPT_HEAD = '\nRESUME TEXT:\n"'
+_USER_PROMPT_MID = '"\n\nJOB DESCRIPTION:\n"'
+_USER_PROMPT_AFTER_JOB = '"\n'
+
+def _build_user_prompt(
+    resume_text: str,
+    job_text: str,
+    skills_hint: str,
+    task_instruction: str,
+) -> str:
+    """Assemble the user message for an extraction call."""
+    return "".join((
+        _USER_PROMPT_HEAD, resume_text,
+        _USER_PROMPT_MID, job_text,
+        _USER_PROMPT_AFTER_JOB, skills_hint,
+        "\n", task_instruction, "\n",
+    ))
+
+# Optional split mode: requirement matching (needed for scoring) and the
+# narrative fields run as two concurrent calls, the second on the mini model.
+# Lower latency, but the resume and job text are sent twice.
+SPLIT_EXTRACTION_ENABLED = os.getenv("AI_SPLIT_EXTRACTION", "false").lower() == "true"
+
+# task -> (instruction, max output tokens)
+EXTRACTION_TASKS = {
+    "full": (
+        "Extract requirements, match them to the resume, and identify gaps. Return JSON only.",
+        1500,
+    ),
+    "matches": (
+        'Complete TASKS 1-3 only. Return JSON with just the "requirements" and "experience" fields.',
+        1500,
+    ),
+    "narrative": (
+        'Complete TASK 4 only. Return JSON with just the "gaps", "job_title", '
+        '"company_name" and "summary" fields.',
+        800,
+    ),
+}
+
+
+# Floors/ceiling for direct and batch callers; the /api/analyze route applies
+# its own stricter limits before calling in
+MIN_RESUME_CHARS = 50
+MIN_JOB_CHARS = 20
+MAX_INPUT_CHARS = 100_000
+
+def _check_analysis_input(resume_text: str, job_text: str) -> Optional[str]:
+    """Return an error message for input not worth an API call, else None."""
+    if len((resume_text or "").strip()) < MIN_RESUME_CHARS:
+        return "Resume text too short"
+    if len((job_text or "").strip()) < MIN_JOB_CHARS:
+        return "Job description text too short"
+    if len(resume_text) > MAX_INPUT_CHARS or len(job_text) > MAX_INPUT_CHARS:
+        return "Input text too long"
+    return None
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # MAIN ANALYSIS FUNCTION
@@ -186,252 +865,677 @@ def analyze_resume(
     start_time = time.time()
     logger.info("Starting AI-powered resume analysis (hybrid mode v2)")
     
+    input_error = _check_analysis_input(resume_text, job_text)
+    if input_error:
+        return create_error_response(input_error)
+    
     try:
-        # ─────────────────────────────────────────────────────────────────
-        # STEP 1: AI Extraction
-        # ─────────────────────────────────────────────────────────────────
-        
-        user_prompt = USER_PROMPT_TEMPLATE.format(
-            resume_text=resume_text,
-            job_text=job_text
-        )
-        
-        # Check cache first for consistency
-        cache_key = _get_cache_key(resume_text, job_text)
-        cached_result = _get_cached_extraction(cache_key)
-        
-        if cached_result:
-            logger.info("Using cached extraction (ensuring consistent results)")
-            ai_extraction = cached_result
-        else:
-            # Call OpenAI with deterministic settings
-            response = client.chat.completions.create(
-                model=os.getenv("OPENAI_MODEL", "gpt-4o"),
-                response_format={"type": "json_object"},
-                messages=[
-                    {"role": "system", "content": EXTRACTION_PROMPT},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0,      # Maximum determinism
-                max_tokens=3000,
-                seed=42,            # Fixed seed for reproducibility
-            )
-            
-            ai_extraction = parse_extraction_response(response)
-            _cache_extraction(cache_key, ai_extraction)  # Cache for future requests
-            logger.info("AI extraction completed and cached")
+        # Quality analysis only needs the resume; run it during the API call
+        quality_future = _start_quality_analysis(resume_text, include_quality_analysis)
         
         # ─────────────────────────────────────────────────────────────────
-        # STEP 2: Deterministic Scoring
+        # STEP 1: AI Extraction
         # ─────────────────────────────────────────────────────────────────
         
-        requirements = ai_extraction.get("requirements", [])
-        experience = ai_extraction.get("experience", {})
-        gaps = ai_extraction.get("gaps", [])
-        
-        # Detect senior role
-        job_lower = job_text.lower()
-        is_senior_role = any(term in job_lower for term in [
-            "senior", "lead", "principal", "staff", "architect", "manager", "director"
-        ])
-        
-        scoring_result = calculate_score(
-            requirements=requirements,
-            required_years=experience.get("required_years", 0),
-            candidate_years=experience.get("candidate_years", 0),
-            is_senior_role=is_senior_role,
-            seniority_signals_found=len(experience.get("seniority_signals", [])),
-            resume_text=resume_text,
-        )
-        logger.info(f"Deterministic score: {scoring_result.score}")
-        
-        # ─────────────────────────────────────────────────────────────────
-        # STEP 3: Optimization Plan
-        # ─────────────────────────────────────────────────────────────────
+        ai_extraction = _extract_requirements(resume_text, job_text)
         
-        optimization_plan = generate_optimization_plan(
-            score=scoring_result.score,
-            gaps=gaps,
-            requirements=requirements,
+        return _build_analysis_result(
+            ai_extraction=ai_extraction,
+            quality_future=quality_future,
             resume_text=resume_text,
+            job_text=job_text,
+            include_quality_analysis=include_quality_analysis,
+            include_interview_prep=include_interview_prep,
+            include_cover_letter=include_cover_letter,
+            cover_letter_tone=cover_letter_tone,
+            start_time=start_time,
         )
         
-        # ─────────────────────────────────────────────────────────────────
-        # STEP 3.5: Generate Truthful Evaluation
-        # ─────────────────────────────────────────────────────────────────
-        
-        # Build tier_scores dict for evaluation
-        tier_scores = {
-            1: {
-                "total": scoring_result.tier1.total_count,
-                "matched": scoring_result.tier1.matched_count,
-                "details": scoring_result.tier1.match_details,
-            },
-            2: {
-                "total": scoring_result.tier2.total_count,
-                "matched": scoring_result.tier2.matched_count,
-                "details": scoring_result.tier2.match_details,
-            },
-            3: {
-                "total": scoring_result.tier3.total_count,
-                "matched": scoring_result.tier3.matched_count,
-                "details": scoring_result.tier3.match_details,
-            },
-        }
+    except Exception as e:
+        logger.exception("Error in AI analysis: %s", e)
+        return create_error_response(str(e))
+
+
+async def analyze_resume_async(
+    resume_text: str, 
+    job_text: str,
+    include_quality_analysis: bool = True,
+    include_interview_prep: bool = False,
+    include_cover_letter: bool = False,
+    cover_letter_tone: str = "professional",
+    openai_client: Optional[AsyncOpenAI] = None,
+) -> Dict[str, Any]:
+    """
+    Async variant of analyze_resume() for callers running an event loop.
+    
+    Args:
+        openai_client: AsyncOpenAI client to use (defaults to the module client).
+            AsyncOpenAI connections are bound to an event loop, so pass a client
+            created inside the loop when calling from asyncio.run().
         
-        evaluation = generate_evaluation(
-            score=scoring_result.score,
-            tier_scores=tier_scores,
-            missing_critical=scoring_result.missing_critical,
-            matched_critical=scoring_result.matched_critical,
-            weak_matches=scoring_result.weak_matches,
-            experience_ratio=scoring_result.experience_ratio,
-            resume_text=resume_text,
+    See analyze_resume() for the remaining arguments and return value.
+    """
+    start_time = time.time()
+    logger.info("Starting AI-powered resume analysis (hybrid mode v2, async)")
+    
+    input_error = _check_analysis_input(resume_text, job_text)
+    if input_error:
+        return create_error_response(input_error)
+    
+    try:
+        quality_future = _start_quality_analysis(resume_text, include_quality_analysis)
+        ai_extraction = await _extract_requirements_async(
+            resume_text, job_text, openai_client or aclient
         )
-        logger.info(f"Evaluation: Hiring={evaluation.hiring_status}, ATS={evaluation.ats_status}")
-        
-        # ─────────────────────────────────────────────────────────────────
-        # STEP 4: Transform to Frontend Format
-        # ─────────────────────────────────────────────────────────────────
         
-        result = transform_to_legacy_format(
-            scoring_result=scoring_result,
+        # Scoring and the analyzers are local CPU work (no API calls); run them
+        # in a worker thread so other requests' API calls keep progressing
+        return await asyncio.to_thread(
+            _build_analysis_result,
             ai_extraction=ai_extraction,
-            optimization_plan=optimization_plan
+            quality_future=quality_future,
+            resume_text=resume_text,
+            job_text=job_text,
+            include_quality_analysis=include_quality_analysis,
+            include_interview_prep=include_interview_prep,
+            include_cover_letter=include_cover_letter,
+            cover_letter_tone=cover_letter_tone,
+            start_time=start_time,
         )
         
-        # ─────────────────────────────────────────────────────────────────
-        # STEP 5: Optional - Resume Quality Analysis
-        # ─────────────────────────────────────────────────────────────────
-        
-        if include_quality_analysis:
-            try:
-                quality_result = analyze_resume_quality(resume_text)
-                result["resume_quality"] = format_quality_report(quality_result)
-                logger.info(f"Quality analysis: {quality_result.overall_score}/100")
-            except Exception as e:
-                logger.warning(f"Quality analysis failed: {e}")
-                result["resume_quality"] = None
-        
-        # ─────────────────────────────────────────────────────────────────
-        # STEP 6: Optional - Interview Questions
-        # ─────────────────────────────────────────────────────────────────
+    except Exception as e:
+        logger.exception("Error in AI analysis: %s", e)
+        return create_error_response(str(e))
+
+
+async def analyze_resumes_batch(
+    pairs: List[Tuple[str, str]],
+    concurrency: int = 8,
+    **options: Any,
+) -> List[Dict[str, Any]]:
+    """
+    Analyze many (resume_text, job_text) pairs with bounded concurrency.
+    
+    The OpenAI round-trip dominates each analysis, so keeping several in
+    flight turns total time from the sum of latencies into roughly the max.
+    
+    Args:
+        pairs: List of (resume_text, job_text) tuples
+        concurrency: Maximum number of analyses in flight at once
+        **options: Passed through to analyze_resume_async()
         
-        if include_interview_prep:
-            try:
-                job_title = ai_extraction.get("job_title", "this role")
-                interview_result = generate_interview_questions(
-                    job_title=job_title,
-                    requirements=requirements,
-                    gaps=gaps,
-                    num_questions=12,
+    Returns:
+        List of analysis results in the same order as pairs
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async with AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0) as batch_client:
+        async def run(resume_text: str, job_text: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await analyze_resume_async(
+                    resume_text, job_text, openai_client=batch_client, **options
                 )
-                result["interview_prep"] = format_interview_prep(interview_result)
-                logger.info(f"Generated {interview_result.question_count} interview questions")
-            except Exception as e:
-                logger.warning(f"Interview prep failed: {e}")
-                result["interview_prep"] = None
         
-        # ─────────────────────────────────────────────────────────────────
-        # STEP 7: Optional - Cover Letter
-        # ─────────────────────────────────────────────────────────────────
-        
-        if include_cover_letter:
-            try:
-                # Map tone string to enum
-                tone_map = {
-                    "professional": ToneStyle.PROFESSIONAL,
-                    "confident": ToneStyle.CONFIDENT,
-                    "conversational": ToneStyle.CONVERSATIONAL,
-                    "executive": ToneStyle.EXECUTIVE,
-                }
-                tone = tone_map.get(cover_letter_tone, ToneStyle.PROFESSIONAL)
-                
-                # Extract resume data for cover letter
-                resume_data = extract_resume_data_for_cover_letter(resume_text, result)
-                
-                job_title = ai_extraction.get("job_title", "this position")
-                company_name = ai_extraction.get("company_name", "your company")
-                
-                cover_result = generate_cover_letter(
-                    job_title=job_title,
-                    company_name=company_name,
-                    requirements=requirements,
-                    resume_data=resume_data,
-                    gaps=gaps,
-                    tone=tone,
-                    include_gap_acknowledgment=False,
-                    target_length="medium",
-                )
-                result["cover_letter"] = format_cover_letter_response(cover_result)
-                logger.info(f"Generated cover letter: {cover_result.word_count} words")
-            except Exception as e:
-                logger.warning(f"Cover letter generation failed: {e}")
-                result["cover_letter"] = None
+        results = await asyncio.gather(
+            *(run(resume_text, job_text) for resume_text, job_text in pairs),
+            return_exceptions=True,
+        )
+    
+    return [
+        create_error_response(str(r)) if isinstance(r, BaseException) else r
+        for r in results
+    ]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# BATCH API (bulk jobs, ~50% cheaper, results within 24h)
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _batch_custom_id(index: int) -> str:
+    """Batch line id for the pair at this position."""
+    return f"pair-{index}"
+
+def submit_analysis_batch(pairs: List[Tuple[str, str]]) -> str:
+    """
+    Submit extraction requests for many pairs to the OpenAI Batch API.
+    
+    For overnight/bulk work where a 24h turnaround is acceptable. Nothing is
+    stored locally: keep the pairs and pass them to collect_batch_results().
+    
+    Args:
+        pairs: List of (resume_text, job_text) tuples
         
-        # ─────────────────────────────────────────────────────────────────
-        # Finalize
-        # ─────────────────────────────────────────────────────────────────
+    Returns:
+        The OpenAI batch id
         
-        elapsed_time = time.time() - start_time
-        result["processing_time_seconds"] = round(elapsed_time, 2)
-        result["scoring_method"] = "hybrid_v2"
-        result["features_enabled"] = {
-            "quality_analysis": include_quality_analysis,
-            "interview_prep": include_interview_prep,
-            "cover_letter": include_cover_letter,
-        }
+    Raises:
+        ValueError: If no pair passes input validation (or pairs is empty)
+    """
+    lines = []
+    for index, (resume_text, job_text) in enumerate(pairs):
+        if _check_analysis_input(resume_text, job_text):
+            continue  # Reported by collect_batch_results()
+        body = _build_extraction_request(resume_text, job_text, pick_model(resume_text, job_text))
+        body.update(body.pop("extra_body"))  # Batch bodies take these fields inline
+        lines.append(_json_dumps({
+            "custom_id": _batch_custom_id(index),
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": body,
+        }))
+    
+    if not lines:
+        # The Batch API rejects an empty input file
+        raise ValueError("no valid pairs to submit")
+    
+    batch_file = client.files.create(
+        file=("extractions.jsonl", "\n".join(lines).encode()),
+        purpose="batch",
+    )
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    logger.info("Submitted batch %s with %s requests", batch.id, len(lines))
+    return batch.id
+
+
+def collect_batch_results(
+    batch_id: str,
+    pairs: List[Tuple[str, str]],
+    include_quality_analysis: bool = True,
+    include_interview_prep: bool = False,
+    include_cover_letter: bool = False,
+    cover_letter_tone: str = "professional",
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Score the results of a batch created by submit_analysis_batch().
+    
+    Args:
+        batch_id: Id returned by submit_analysis_batch()
+        pairs: The same (resume_text, job_text) pairs, in the same order
         
-        # Add gate-based evaluation data
-        result["evaluation"] = {
-            "hiring": {
-                "status": evaluation.hiring_status,
-                "summary": evaluation.hiring_summary,
-                "reassurance": evaluation.hiring_reassurance,
-            },
-            "ats": {
-                "status": evaluation.ats_status,
-                "checks": evaluation.ats_checks,
-                "summary": evaluation.ats_summary,
-            },
-            "search": {
-                "status": evaluation.search_status,
-                "matched": evaluation.search_matched,
-                "total": evaluation.search_total,
-                "terms": evaluation.searchable_terms,
-                "summary": evaluation.search_summary,
-            },
-            "alignment": {
-                "score": evaluation.alignment_score,
-                "label": evaluation.alignment_label,
-                "strengths": evaluation.alignment_strengths,
-                "refinements": evaluation.alignment_refinements,
-            },
-            "readability": {
-                "label": evaluation.readability_label,
-                "notes": evaluation.readability_notes,
-            },
-            "roleMisalignment": {
-                "detected": evaluation.has_role_misalignment,
-                "severity": evaluation.misalignment_severity,
-                "reasons": evaluation.misalignment_reasons,
-                "rewritingCanHelp": evaluation.rewriting_can_help,
-                "rewritingCannotFix": evaluation.rewriting_cannot_fix,
-                "alternativeRoles": evaluation.alternative_roles,
-            },
-            "verdict": {
-                "ready_to_submit": evaluation.ready_to_submit,
-                "message": evaluation.verdict_message,
-                "stop_optimizing": evaluation.stop_optimizing,
-            },
-        }
+    Returns:
+        Analysis results in the same order as pairs, or None if the batch
+        hasn't completed yet. Failed requests get an error response.
+    """
+    batch = client.batches.retrieve(batch_id)
+    if batch.status != "completed":
+        logger.info("Batch %s is %s", batch_id, batch.status)
+        return None
+    
+    contents: Dict[str, str] = {}
+    if batch.output_file_id:
+        for line in client.files.content(batch.output_file_id).text.splitlines():
+            item = _json_loads(line)
+            response = item.get("response") or {}
+            if response.get("status_code") == 200:
+                contents[item["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+    
+    results = []
+    for index, (resume_text, job_text) in enumerate(pairs):
+        start_time = time.time()
+        input_error = _check_analysis_input(resume_text, job_text)
+        if input_error:
+            results.append(create_error_response(input_error))
+            continue
+        content = contents.get(_batch_custom_id(index))
+        if content is None:
+            results.append(create_error_response("Batch request failed"))
+            continue
+        try:
+            ai_extraction = parse_extraction_response(content)
+            model = pick_model(resume_text, job_text)
+            _cache_extraction(_get_cache_key(resume_text, job_text, model), ai_extraction)
+            results.append(_build_analysis_result(
+                ai_extraction=ai_extraction,
+                resume_text=resume_text,
+                job_text=job_text,
+                include_quality_analysis=include_quality_analysis,
+                include_interview_prep=include_interview_prep,
+                include_cover_letter=include_cover_letter,
+                cover_letter_tone=cover_letter_tone,
+                start_time=start_time,
+            ))
+        except Exception as e:
+            logger.exception("Error scoring batch result %s: %s", index, e)
+            results.append(create_error_response(str(e)))
+    
+    return results
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PIPELINE STEPS
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _build_extraction_request(
+    resume_text: str,
+    job_text: str,
+    model: str,
+    task: str = "full",
+) -> Dict[str, Any]:
+    """Build chat completion arguments for an extraction call (see EXTRACTION_TASKS)."""
+    task_instruction, max_tokens = EXTRACTION_TASKS[task]
+    required_skills = extract_required_skills(job_text)
+    skills_hint = ""
+    if required_skills:
+        skills_hint = "\nPRE-EXTRACTED REQUIREMENTS:\n" + "\n".join(
+            f"- {skill}" for skill in required_skills
+        ) + "\n"
+    
+    user_prompt = _build_user_prompt(
+        resume_text=clip_to_tokens(resume_text, MAX_RESUME_TOKENS, "resume"),
+        job_text=clip_to_tokens(job_text, MAX_JOB_TOKENS, "job description"),
+        skills_hint=skills_hint,
+        task_instruction=task_instruction,
+    )
+    
+    # Deterministic settings
+    return {
+        "model": model,
+        "response_format": {"type": "json_object"},
+        "messages": [
+            {"role": "system", "content": EXTRACTION_PROMPT},
+            *FEW_SHOT_MESSAGES,
+            {"role": "user", "content": user_prompt}
+        ],
+        "temperature": 0,      # Maximum determinism
+        "max_tokens": max_tokens,
+        "seed": 42,            # Fixed seed for reproducibility
+        "extra_body": {"prompt_cache_key": PROMPT_CACHE_KEY},
+    }
+
+
+def _build_split_requests(
+    resume_text: str,
+    job_text: str,
+    model: str,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Build the (matches, narrative) request pair for split extraction mode."""
+    return (
+        _build_extraction_request(resume_text, job_text, model, task="matches"),
+        _build_extraction_request(
+            resume_text, job_text, OPENAI_MODEL_MINI or model, task="narrative"
+        ),
+    )
+
+
+def _merge_split_extraction(matches_content: str, narrative_content: str) -> Dict[str, Any]:
+    """Combine the two split-mode responses into one validated extraction."""
+    result = _load_extraction_json(narrative_content)
+    result.update(_load_extraction_json(matches_content))
+    validate_extraction_response(result)
+    return result
+
+
+def _lookup_extraction(
+    resume_text: str,
+    job_text: str,
+    model: str,
+) -> Tuple[str, Optional[Dict[str, Any]], Optional[np.ndarray]]:
+    """Check the exact and semantic caches. Returns (cache_key, cached, embedding)."""
+    cache_key = _get_cache_key(resume_text, job_text, model)
+    cached_result = _get_cached_extraction(cache_key)
+    
+    embedding = None
+    if not cached_result and AI_SEMANTIC_CACHE_ENABLED:
+        cached_result, embedding = semantic_lookup(resume_text, job_text, model)
+        if cached_result:
+            _cache_extraction(cache_key, cached_result)
+    
+    return cache_key, cached_result, embedding
+
+
+def _store_extraction(
+    cache_key: str,
+    ai_extraction: Dict[str, Any],
+    embedding: Optional[np.ndarray],
+    model: str,
+) -> None:
+    """Cache a fresh extraction for future requests."""
+    _cache_extraction(cache_key, ai_extraction)
+    if embedding is not None:
+        _add_to_semantic_index(cache_key, embedding, model)
+    logger.info("AI extraction completed and cached")
+
+
+def _run_extraction(resume_text: str, job_text: str, model: str) -> Dict[str, Any]:
+    """Call OpenAI (one call, or two concurrent ones in split mode) and parse the result."""
+    if SPLIT_EXTRACTION_ENABLED:
+        matches_request, narrative_request = _build_split_requests(resume_text, job_text, model)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            matches = pool.submit(_create_completion, **matches_request)
+            narrative = pool.submit(_create_completion, **narrative_request)
+            return _merge_split_extraction(matches.result(), narrative.result())
+    
+    content = _create_completion(
+        **_build_extraction_request(resume_text, job_text, model)
+    )
+    return parse_extraction_response(content)
+
+
+async def _run_extraction_async(
+    resume_text: str,
+    job_text: str,
+    model: str,
+    openai_client: AsyncOpenAI,
+) -> Dict[str, Any]:
+    """Async variant of _run_extraction()."""
+    if SPLIT_EXTRACTION_ENABLED:
+        matches_request, narrative_request = _build_split_requests(resume_text, job_text, model)
+        matches_content, narrative_content = await asyncio.gather(
+            _create_completion_async(openai_client, **matches_request),
+            _create_completion_async(openai_client, **narrative_request),
+        )
+        return _merge_split_extraction(matches_content, narrative_content)
+    
+    content = await _create_completion_async(
+        openai_client, **_build_extraction_request(resume_text, job_text, model)
+    )
+    return parse_extraction_response(content)
+
+
+def _extract_requirements(resume_text: str, job_text: str) -> Dict[str, Any]:
+    """STEP 1: Extract and classify requirements, using the cache when possible."""
+    if _should_skip_extraction(resume_text, job_text):
+        return _no_match_extraction(job_text)
+    
+    model = pick_model(resume_text, job_text)
+    
+    # Check cache first for consistency
+    cache_key, cached_result, embedding = _lookup_extraction(resume_text, job_text, model)
+    if cached_result:
+        logger.info("Using cached extraction (ensuring consistent results)")
+        return cached_result
+    
+    is_owner, inflight = _claim_inflight(cache_key)
+    if not is_owner:
+        logger.info("Waiting on an identical in-flight extraction")
+        return inflight.result()
+    
+    try:
+        try:
+            ai_extraction = _run_extraction(resume_text, job_text, model)
+        except ValueError:
+            if not OPENAI_MODEL_FALLBACK or OPENAI_MODEL_FALLBACK == model:
+                raise
+            logger.warning("Invalid JSON from %s, retrying with %s", model, OPENAI_MODEL_FALLBACK)
+            ai_extraction = _run_extraction(resume_text, job_text, OPENAI_MODEL_FALLBACK)
         
-        logger.info(f"Analysis completed in {elapsed_time:.2f}s")
-        return result
+        _store_extraction(cache_key, ai_extraction, embedding, model)
+        inflight.set_result(ai_extraction)
+        return ai_extraction
+    except BaseException as e:
+        inflight.set_exception(e)
+        raise
+    finally:
+        _release_inflight(cache_key)
+
+
+async def _extract_requirements_async(
+    resume_text: str,
+    job_text: str,
+    openai_client: AsyncOpenAI,
+) -> Dict[str, Any]:
+    """Async variant of _extract_requirements()."""
+    if _should_skip_extraction(resume_text, job_text):
+        return _no_match_extraction(job_text)
+    
+    model = pick_model(resume_text, job_text)
+    
+    # Cache lookups may hit SQLite or the embeddings API, keep them off the loop
+    cache_key, cached_result, embedding = await asyncio.to_thread(
+        _lookup_extraction, resume_text, job_text, model
+    )
+    if cached_result:
+        logger.info("Using cached extraction (ensuring consistent results)")
+        return cached_result
+    
+    is_owner, inflight = _claim_inflight(cache_key)
+    if not is_owner:
+        logger.info("Waiting on an identical in-flight extraction")
+        return await asyncio.wrap_future(inflight)
+    
+    try:
+        try:
+            ai_extraction = await _run_extraction_async(resume_text, job_text, model, openai_client)
+        except ValueError:
+            if not OPENAI_MODEL_FALLBACK or OPENAI_MODEL_FALLBACK == model:
+                raise
+            logger.warning("Invalid JSON from %s, retrying with %s", model, OPENAI_MODEL_FALLBACK)
+            ai_extraction = await _run_extraction_async(
+                resume_text, job_text, OPENAI_MODEL_FALLBACK, openai_client
+            )
         
-    except Exception as e:
-        logger.error(f"Error in AI analysis: {str(e)}")
-        return create_error_response(str(e))
+        await asyncio.to_thread(_store_extraction, cache_key, ai_extraction, embedding, model)
+        inflight.set_result(ai_extraction)
+        return ai_extraction
+    except BaseException as e:
+        inflight.set_exception(e)
+        raise
+    finally:
+        _release_inflight(cache_key)
+
+
+# Shared pool for analyzers that only need the resume and can run while the
+# OpenAI call is in flight (the call releases the GIL while waiting)
+_ANALYZER_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="analyzer")
+QUALITY_ANALYSIS_TIMEOUT_SECONDS = 30
+
+def _start_quality_analysis(resume_text: str, enabled: bool) -> Optional[Future]:
+    """Submit analyze_resume_quality to the analyzer pool if requested."""
+    if not enabled:
+        return None
+    return _ANALYZER_EXECUTOR.submit(analyze_resume_quality, resume_text)
+
+
+@dataclass(slots=True)
+class ExtractionResult:
+    """Typed view of a validated AI extraction, used while building a result."""
+    requirements: List[Dict[str, Any]]
+    experience: Dict[str, Any]
+    gaps: List[Dict[str, Any]]
+    job_title: str = ""
+    company_name: str = ""
+    
+    @classmethod
+    def from_dict(cls, ai_extraction: Dict[str, Any]) -> "ExtractionResult":
+        """Build from the cached/serialized dict form."""
+        return cls(
+            requirements=ai_extraction.get("requirements", []),
+            experience=ai_extraction.get("experience", {}),
+            gaps=ai_extraction.get("gaps", []),
+            job_title=ai_extraction.get("job_title") or "",
+            company_name=ai_extraction.get("company_name") or "",
+        )
+
+
+# Substring match, same as the old `term in job_text.lower()` checks, but one
+# case-insensitive pass with no lowercased copy of the job text
+_SENIOR_ROLE_RE = re.compile(
+    "senior|lead|principal|staff|architect|manager|director", re.IGNORECASE
+)
+
+def _build_analysis_result(
+    ai_extraction: Dict[str, Any],
+    resume_text: str,
+    job_text: str,
+    include_quality_analysis: bool,
+    include_interview_prep: bool,
+    include_cover_letter: bool,
+    cover_letter_tone: str,
+    start_time: float,
+    quality_future: Optional[Future] = None,
+) -> Dict[str, Any]:
+    """
+    STEPS 2-7: Deterministic scoring and optional analyzers over an extraction.
+    
+    quality_future, if given, is a quality analysis already started by
+    _start_quality_analysis(); otherwise it runs inline.
+    """
+    # ─────────────────────────────────────────────────────────────────
+    # STEP 2: Deterministic Scoring
+    # ─────────────────────────────────────────────────────────────────
+    
+    # Caches and the scoring engine use the dict form; read fields once here
+    extraction = ExtractionResult.from_dict(ai_extraction)
+    requirements = extraction.requirements
+    experience = extraction.experience
+    gaps = extraction.gaps
+    
+    # Detect senior role
+    is_senior_role = _SENIOR_ROLE_RE.search(job_text) is not None
+    
+    scoring_result = calculate_score(
+        requirements=requirements,
+        required_years=experience.get("required_years", 0),
+        candidate_years=experience.get("candidate_years", 0),
+        is_senior_role=is_senior_role,
+        seniority_signals_found=len(experience.get("seniority_signals", [])),
+        resume_text=resume_text,
+    )
+    logger.info("Deterministic score: %s", scoring_result.score)
+    
+    # ─────────────────────────────────────────────────────────────────
+    # STEP 3: Optimization Plan
+    # ─────────────────────────────────────────────────────────────────
+    
+    optimization_plan = generate_optimization_plan(
+        score=scoring_result.score,
+        gaps=gaps,
+        requirements=requirements,
+        resume_text=resume_text,
+    )
+    
+    # ─────────────────────────────────────────────────────────────────
+    # STEP 3.5: Generate Truthful Evaluation
+    # ─────────────────────────────────────────────────────────────────
+    
+    # Build tier_scores dict for evaluation
+    tier_scores = {
+        1: {
+            "total": scoring_result.tier1.total_count,
+            "matched": scoring_result.tier1.matched_count,
+            "details": scoring_result.tier1.match_details,
+        },
+        2: {
+            "total": scoring_result.tier2.total_count,
+            "matched": scoring_result.tier2.matched_count,
+            "details": scoring_result.tier2.match_details,
+        },
+        3: {
+            "total": scoring_result.tier3.total_count,
+            "matched": scoring_result.tier3.matched_count,
+            "details": scoring_result.tier3.match_details,
+        },
+    }
+    
+    evaluation = generate_evaluation(
+        score=scoring_result.score,
+        tier_scores=tier_scores,
+        missing_critical=scoring_result.missing_critical,
+        matched_critical=scoring_result.matched_critical,
+        weak_matches=scoring_result.weak_matches,
+        experience_ratio=scoring_result.experience_ratio,
+        resume_text=resume_text,
+    )
+    logger.info("Evaluation: Hiring=%s, ATS=%s", evaluation.hiring_status, evaluation.ats_status)
+    
+    # ─────────────────────────────────────────────────────────────────
+    # STEP 4: Transform to Frontend Format
+    # ─────────────────────────────────────────────────────────────────
+    
+    result = transform_to_legacy_format(
+        scoring_result=scoring_result,
+        ai_extraction=ai_extraction,
+        optimization_plan=optimization_plan
+    )
+    
+    # ─────────────────────────────────────────────────────────────────
+    # STEP 5: Optional - Resume Quality Analysis
+    # ─────────────────────────────────────────────────────────────────
+    
+    if include_quality_analysis:
+        try:
+            if quality_future is not None:
+                quality_result = quality_future.result(timeout=QUALITY_ANALYSIS_TIMEOUT_SECONDS)
+            else:
+                quality_result = analyze_resume_quality(resume_text)
+            result["resume_quality"] = format_quality_report(quality_result)
+            logger.info("Quality analysis: %s/100", quality_result.overall_score)
+        except Exception as e:
+            logger.warning("Quality analysis failed: %s", e)
+            result["resume_quality"] = None
+    
+    # ─────────────────────────────────────────────────────────────────
+    # STEP 6: Optional - Interview Questions
+    # ─────────────────────────────────────────────────────────────────
+    
+    if include_interview_prep:
+        try:
+            job_title = extraction.job_title or "this role"
+            interview_result = generate_interview_questions(
+                job_title=job_title,
+                requirements=requirements,
+                gaps=gaps,
+                num_questions=12,
+            )
+            result["interview_prep"] = format_interview_prep(interview_result)
+            logger.info("Generated %s interview questions", interview_result.question_count)
+        except Exception as e:
+            logger.warning("Interview prep failed: %s", e)
+            result["interview_prep"] = None
+    
+    # ─────────────────────────────────────────────────────────────────
+    # STEP 7: Optional - Cover Letter
+    # ─────────────────────────────────────────────────────────────────
+    
+    if include_cover_letter:
+        try:
+            tone = TONE_MAP.get(cover_letter_tone, ToneStyle.PROFESSIONAL)
+            
+            # Extract resume data for cover letter
+            resume_data = extract_resume_data_for_cover_letter(resume_text, result)
+            
+            job_title = extraction.job_title or "this position"
+            company_name = extraction.company_name or "your company"
+            
+            cover_result = generate_cover_letter(
+                job_title=job_title,
+                company_name=company_name,
+                requirements=requirements,
+                resume_data=resume_data,
+                gaps=gaps,
+                tone=tone,
+                include_gap_acknowledgment=False,
+                target_length="medium",
+            )
+            result["cover_letter"] = format_cover_letter_response(cover_result)
+            logger.info("Generated cover letter: %s words", cover_result.word_count)
+        except Exception as e:
+            logger.warning("Cover letter generation failed: %s", e)
+            result["cover_letter"] = None
+    
+    # ─────────────────────────────────────────────────────────────────
+    # Finalize
+    # ─────────────────────────────────────────────────────────────────
+    
+    elapsed_time = time.time() - start_time
+    result["processing_time_seconds"] = round(elapsed_time, 2)
+    result["scoring_method"] = "hybrid_v2"
+    result["features_enabled"] = {
+        "quality_analysis": include_quality_analysis,
+        "interview_prep": include_interview_prep,
+        "cover_letter": include_cover_letter,
+    }
+    
+    # Add gate-based evaluation data
+    result["evaluation"] = format_evaluation(evaluation)
+    
+    logger.info("Analysis completed in %.2fs", elapsed_time)
+    return result
+
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -452,7 +1556,7 @@ def get_resume_quality(resume_text: str) -> Dict[str, Any]:
         result = analyze_resume_quality(resume_text)
         return format_quality_report(result)
     except Exception as e:
-        logger.error(f"Quality analysis error: {e}")
+        logger.error("Quality analysis error: %s", e)
         return {"error": str(e)}
 
 
@@ -483,7 +1587,7 @@ def get_interview_questions(
         )
         return format_interview_prep(result)
     except Exception as e:
-        logger.error(f"Interview prep error: {e}")
+        logger.error("Interview prep error: %s", e)
         return {"error": str(e)}
 
 
@@ -510,13 +1614,7 @@ def get_cover_letter(
         Cover letter result
     """
     try:
-        tone_map = {
-            "professional": ToneStyle.PROFESSIONAL,
-            "confident": ToneStyle.CONFIDENT,
-            "conversational": ToneStyle.CONVERSATIONAL,
-            "executive": ToneStyle.EXECUTIVE,
-        }
-        tone_style = tone_map.get(tone, ToneStyle.PROFESSIONAL)
+        tone_style = TONE_MAP.get(tone, ToneStyle.PROFESSIONAL)
         
         resume_data = extract_resume_data_for_cover_letter(resume_text)
         
@@ -530,7 +1628,7 @@ def get_cover_letter(
         )
         return format_cover_letter_response(result)
     except Exception as e:
-        logger.error(f"Cover letter error: {e}")
+        logger.error("Cover letter error: %s", e)
         return {"error": str(e)}
 
 
@@ -538,71 +1636,85 @@ def get_cover_letter(
 # HELPER FUNCTIONS
 # ═══════════════════════════════════════════════════════════════════════════
 
-def parse_extraction_response(response) -> Dict[str, Any]:
-    """Parse the OpenAI API extraction response."""
+def parse_extraction_response(content: str) -> Dict[str, Any]:
+    """Parse the OpenAI API extraction response text."""
+    result = _load_extraction_json(content)
+    validate_extraction_response(result)
+    return result
+
+
+def _load_extraction_json(content: str) -> Dict[str, Any]:
+    """Decode response JSON, raising ValueError if the model returned invalid JSON."""
     try:
-        content = response.choices[0].message.content
-        result = json.loads(content)
-        validate_extraction_response(result)
-        return result
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse OpenAI response: {e}")
+        return _json_loads(content)
+    except json.JSONDecodeError as e:  # orjson.JSONDecodeError subclasses this
+        logger.error("Failed to parse OpenAI response: %s", e)
         raise ValueError(f"Invalid JSON from OpenAI: {e}")
 
 
+_REQUIRED_EXTRACTION_FIELDS = frozenset({"requirements", "experience", "gaps"})
+_REQUIRED_REQUIREMENT_KEYS = frozenset({"text", "tier", "match_type"})
+
 def validate_extraction_response(result: Dict[str, Any]) -> None:
     """Validate AI extraction response has required fields."""
-    required_fields = ["requirements", "experience", "gaps"]
-    for field in required_fields:
-        if field not in result:
-            logger.warning(f"Missing field: {field}, using default")
-            if field == "requirements":
-                result["requirements"] = []
-            elif field == "experience":
-                result["experience"] = {
-                    "required_years": 0, 
-                    "candidate_years": 0, 
-                    "seniority_signals": []
-                }
-            elif field == "gaps":
-                result["gaps"] = []
+    # Fast path: with temperature 0 the model almost always returns the full shape
+    if _REQUIRED_EXTRACTION_FIELDS <= result.keys() and all(
+        _REQUIRED_REQUIREMENT_KEYS <= req.keys() for req in result["requirements"]
+    ):
+        return
+    
+    missing = _REQUIRED_EXTRACTION_FIELDS - result.keys()
+    if missing:
+        logger.warning("Missing fields: %s, using defaults", sorted(missing))
+        result.setdefault("requirements", [])
+        result.setdefault("experience", {
+            "required_years": 0, 
+            "candidate_years": 0, 
+            "seniority_signals": []
+        })
+        result.setdefault("gaps", [])
     
     # Validate requirements structure
-    for req in result.get("requirements", []):
-        if "text" not in req:
-            req["text"] = "Unknown requirement"
-        if "tier" not in req:
-            req["tier"] = 2
-        if "match_type" not in req:
-            req["match_type"] = "NONE"
+    for req in result["requirements"]:
+        req.setdefault("text", "Unknown requirement")
+        req.setdefault("tier", 2)
+        req.setdefault("match_type", "NONE")
 
 
+_ERROR_RESPONSE_TEMPLATE: Dict[str, Any] = {
+    "score": 0,
+    "interpretation": "ERROR",
+    "summary": "Analysis failed due to a technical error.",
+    "points_summary": {
+        "tier1_earned": 0, "tier1_possible": 0,
+        "tier2_earned": 0, "tier2_possible": 0,
+        "tier3_earned": 0, "tier3_possible": 0,
+        "total_earned": 0, "total_possible": 0,
+    },
+    "experience_analysis": {
+        "required_years": 0,
+        "candidate_years": 0,
+        "seniority_signals": [],
+    },
+    "keyword_analysis": {"missing": [], "present": []},
+    "critical_gaps": [],
+    "quick_wins": [{
+        "type": "critical",
+        "title": "Analysis Failed",
+        "description": "Please try again later."
+    }],
+    "requirements_breakdown": [],
+}
+
+# Serialized once; decoding it is a cheaper fresh deep copy than copy.deepcopy
+_ERROR_RESPONSE_JSON = _json_dumps(_ERROR_RESPONSE_TEMPLATE)
+
 def create_error_response(error_message: str) -> Dict[str, Any]:
     """Create standardized error response."""
+    # Fresh copy so callers can't mutate the shared template
     return {
         "error": f"Analysis failed: {error_message}",
-        "score": 0,
-        "interpretation": "ERROR",
-        "summary": "Analysis failed due to a technical error.",
-        "points_summary": {
-            "tier1_earned": 0, "tier1_possible": 0,
-            "tier2_earned": 0, "tier2_possible": 0,
-            "tier3_earned": 0, "tier3_possible": 0,
-            "total_earned": 0, "total_possible": 0,
-        },
-        "experience_analysis": {
-            "required_years": 0,
-            "candidate_years": 0,
-            "seniority_signals": [],
-        },
-        "keyword_analysis": {"missing": [], "present": []},
-        "critical_gaps": [],
-        "quick_wins": [{
-            "type": "critical",
-            "title": "Analysis Failed",
-            "description": "Please try again later."
-        }],
-        "requirements_breakdown": [],
+        **_json_loads(_ERROR_RESPONSE_JSON),
     }
 
 
@@ -9,28 +9,31 @@ Available modules:
 - cover_letter: Auto-generate tailored cover letters
 """
 
-from .resume_quality import (
-    analyze_resume_quality,
-    format_quality_report,
-    ResumeQualityResult,
-    QualityDimension,
-)
-
-from .interview_prep import (
-    generate_interview_questions,
-    format_interview_prep,
-    InterviewPrepResult,
-    InterviewQuestion,
-    QuestionCategory,
-)
-
-from .cover_letter import (
-    generate_cover_letter,
-    format_cover_letter_response,
-    extract_resume_data_for_cover_letter,
-    CoverLetterResult,
-    ToneStyle,
-)
+import importlib
+
+# Public name -> submodule. Submodules load on first attribute access (PEP 562),
+# so importing one analyzer doesn't pull in the others.
+_LAZY_EXPORTS = {
+    # Resume Quality
+    "analyze_resume_quality": ".resume_quality",
+    "format_quality_report": ".resume_quality",
+    "ResumeQualityResult": ".resume_quality",
+    "QualityDimension": ".resume_quality",
+    
+    # Interview Prep
+    "generate_interview_questions": ".interview_prep",
+    "format_interview_prep": ".interview_prep",
+    "InterviewPrepResult": ".interview_prep",
+    "InterviewQuestion": ".interview_prep",
+    "QuestionCategory": ".interview_prep",
+    
+    # Cover Letter
+    "generate_cover_letter": ".cover_letter",
+    "format_cover_letter_response": ".cover_letter",
+    "extract_resume_data_for_cover_letter": ".cover_letter",
+    "CoverLetterResult": ".cover_letter",
+    "ToneStyle": ".cover_letter",
+}
 
 __all__ = [
     # Resume Quality
@@ -52,4 +55,17 @@ __all__ = [
     "extract_resume_data_for_cover_letter",
     "CoverLetterResult",
     "ToneStyle",
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
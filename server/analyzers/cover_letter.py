@@ -13,8 +13,15 @@ File: server/analyzers/cover_letter.py
 from dataclasses import dataclass
 from typing import List, Dict, Any, Optional
 from enum import Enum
+from itertools import islice
 import re
 
+from utils.text_analysis import (
+    extract_name,
+    extract_years_of_experience,
+    extract_metrics,
+)
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # CONFIGURATION
@@ -27,6 +34,14 @@ class ToneStyle(str, Enum):
     EXECUTIVE = "executive"        # C-suite level
 
 
+# Tier-1 requirements matched this way count as strengths to highlight
+STRONG_MATCH_TYPES = frozenset({"EXACT", "VARIANT"})
+MAX_SKILLS_HIGHLIGHTED = 3
+
+# Quantified resume lines passed on as achievement candidates
+MAX_ACHIEVEMENTS = 5
+
+
 # Paragraph templates by section
 OPENING_TEMPLATES = {
     ToneStyle.PROFESSIONAL: [
@@ -61,6 +76,13 @@ SKILLS_BRIDGE_TEMPLATES = {
     ToneStyle.EXECUTIVE: "My expertise in {skill} positions me to address your immediate needs. {evidence}.",
 }
 
+SKILL_APPLICATIONS = (
+    "drive results",
+    "lead initiatives",
+    "solve complex problems",
+    "deliver measurable impact",
+)
+
 GAP_ACKNOWLEDGMENT_TEMPLATES = {
     ToneStyle.PROFESSIONAL: "While I am still developing my expertise in {skill}, I have demonstrated rapid learning ability and have {related_experience}.",
     ToneStyle.CONFIDENT: "Although {skill} is an area where I'm continuing to grow, my track record shows I master new technologies quickly. {related_experience}.",
@@ -88,11 +110,43 @@ CLOSING_TEMPLATES = {
 }
 
 
+_PLACEHOLDER_RE = re.compile(r"\{(\w+)\}")
+
+
+def _compile_template(src: str):
+    """
+    Compile a ``{name}`` template into a keyword-only f-string function.
+
+    Equivalent to ``src.format(**kwargs)`` (unused kwargs are ignored) but
+    skips re-parsing the format string on every call.
+    """
+    params = list(dict.fromkeys(_PLACEHOLDER_RE.findall(src)))
+    signature = f"*, {', '.join(params)}, **_" if params else "**_"
+    return eval(f"lambda {signature}: f{src!r}", {})
+
+
+def _compile_templates(templates: Dict[ToneStyle, Any]) -> Dict[ToneStyle, Any]:
+    """Compile a tone -> template (or list of templates) table."""
+    return {
+        tone: [_compile_template(t) for t in value] if isinstance(value, list)
+        else _compile_template(value)
+        for tone, value in templates.items()
+    }
+
+
+# Compiled once at import; the generators call these instead of str.format()
+OPENING_FNS = _compile_templates(OPENING_TEMPLATES)
+BODY_ACHIEVEMENT_FNS = _compile_templates(BODY_ACHIEVEMENT_TEMPLATES)
+SKILLS_BRIDGE_FNS = _compile_templates(SKILLS_BRIDGE_TEMPLATES)
+GAP_ACKNOWLEDGMENT_FNS = _compile_templates(GAP_ACKNOWLEDGMENT_TEMPLATES)
+CLOSING_FNS = _compile_templates(CLOSING_TEMPLATES)
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # DATA CLASSES
 # ═══════════════════════════════════════════════════════════════════════════
 
-@dataclass
+@dataclass(slots=True)
 class CoverLetterSection:
     """A section of the cover letter."""
     type: str  # opening, body, skills, closing
@@ -100,7 +154,7 @@ class CoverLetterSection:
     word_count: int
 
 
-@dataclass
+@dataclass(slots=True)
 class CoverLetterResult:
     """Generated cover letter with metadata."""
     full_text: str
@@ -113,6 +167,15 @@ class CoverLetterResult:
     customization_notes: List[str]
 
 
+def _make_section(section_type: str, content: str) -> CoverLetterSection:
+    """Build a section, counting its words."""
+    return CoverLetterSection(
+        type=section_type,
+        content=content,
+        word_count=len(content.split()),
+    )
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # MAIN GENERATION FUNCTION
 # ═══════════════════════════════════════════════════════════════════════════
@@ -155,11 +218,14 @@ def generate_cover_letter(
     current_company = resume_data.get("current_company", "my current company")
     achievements = resume_data.get("achievements", [])
     
-    # Get matched skills with evidence
-    strong_matches = [
-        r for r in requirements 
-        if r.get("match_type") in ["EXACT", "VARIANT"] and r.get("tier") == 1
-    ]
+    # Get matched skills with evidence (the letter never cites more than 3)
+    strong_matches = list(islice(
+        (
+            r for r in requirements
+            if r.get("match_type") in STRONG_MATCH_TYPES and r.get("tier") == 1
+        ),
+        MAX_SKILLS_HIGHLIGHTED,
+    ))
     
     # ─────────────────────────────────────────────────────────────────────
     # SECTION 1: Opening Paragraph
@@ -172,11 +238,7 @@ def generate_cover_letter(
         domain=domain,
         tone=tone,
     )
-    sections.append(CoverLetterSection(
-        type="opening",
-        content=opening,
-        word_count=len(opening.split()),
-    ))
+    sections.append(_make_section("opening", opening))
     customization_notes.append("Opening customized with job title and company name")
     
     # ─────────────────────────────────────────────────────────────────────
@@ -190,11 +252,7 @@ def generate_cover_letter(
             domain=domain,
             tone=tone,
         )
-        sections.append(CoverLetterSection(
-            type="body",
-            content=body_para,
-            word_count=len(body_para.split()),
-        ))
+        sections.append(_make_section("body", body_para))
         achievements_included.extend(achievements[:2])
         customization_notes.append("Included quantified achievements from resume")
     
@@ -207,12 +265,8 @@ def generate_cover_letter(
             matches=strong_matches,
             tone=tone,
         )
-        sections.append(CoverLetterSection(
-            type="skills",
-            content=skills_para,
-            word_count=len(skills_para.split()),
-        ))
-        skills_highlighted.extend([m.get("text", "") for m in strong_matches[:3]])
+        sections.append(_make_section("skills", skills_para))
+        skills_highlighted.extend([m.get("text", "") for m in strong_matches])
         customization_notes.append("Highlighted skills that match job requirements")
     
     # ─────────────────────────────────────────────────────────────────────
@@ -225,11 +279,7 @@ def generate_cover_letter(
             strong_skills=strong_matches,
             tone=tone,
         )
-        sections.append(CoverLetterSection(
-            type="gap_acknowledgment",
-            content=gap_para,
-            word_count=len(gap_para.split()),
-        ))
+        sections.append(_make_section("gap_acknowledgment", gap_para))
         customization_notes.append("Proactively addressed skill gap with growth mindset")
     
     # ─────────────────────────────────────────────────────────────────────
@@ -240,23 +290,19 @@ def generate_cover_letter(
         company=company_name,
         tone=tone,
     )
-    sections.append(CoverLetterSection(
-        type="closing",
-        content=closing,
-        word_count=len(closing.split()),
-    ))
+    sections.append(_make_section("closing", closing))
     
     # ─────────────────────────────────────────────────────────────────────
     # Assemble Full Letter
     # ─────────────────────────────────────────────────────────────────────
     
-    full_text = "\n\n".join(section.content for section in sections)
+    full_text = "\n\n".join([section.content for section in sections])
     word_count = sum(section.word_count for section in sections)
     
     # Calculate personalization score
     personalization_score = _calculate_personalization_score(
-        company_mentioned=company_name.lower() in full_text.lower(),
-        job_title_mentioned=job_title.lower() in full_text.lower(),
+        company_mentioned=_contains_ignore_case(full_text, company_name),
+        job_title_mentioned=_contains_ignore_case(full_text, job_title),
         skills_count=len(skills_highlighted),
         achievements_count=len(achievements_included),
         gaps_addressed=include_gap_acknowledgment and gaps,
@@ -286,10 +332,10 @@ def _generate_opening(
     tone: ToneStyle,
 ) -> str:
     """Generate opening paragraph."""
-    templates = OPENING_TEMPLATES.get(tone, OPENING_TEMPLATES[ToneStyle.PROFESSIONAL])
+    templates = OPENING_FNS.get(tone, OPENING_FNS[ToneStyle.PROFESSIONAL])
     template = templates[0]  # Use first template
     
-    return template.format(
+    return template(
         job_title=job_title,
         company=company,
         years=years,
@@ -309,34 +355,26 @@ def _generate_achievement_paragraph(
         return ""
     
     # Use first 1-2 achievements
-    achievement_text = achievements[0]
-    
-    # Clean up achievement text
-    achievement_text = achievement_text.strip("•-* ").strip()
+    achievement_text = _clean_bullet(achievements[0])
     
-    # Determine skill application based on achievement
-    skill_applications = [
-        "drive results",
-        "lead initiatives",
-        "solve complex problems",
-        "deliver measurable impact",
-    ]
-    skill_app = skill_applications[hash(achievement_text) % len(skill_applications)]
+    # Vary the phrasing by achievement; len() keeps it stable across processes
+    # (str hash() is randomized per interpreter)
+    skill_app = SKILL_APPLICATIONS[len(achievement_text) % len(SKILL_APPLICATIONS)]
     
-    template = BODY_ACHIEVEMENT_TEMPLATES.get(tone, BODY_ACHIEVEMENT_TEMPLATES[ToneStyle.PROFESSIONAL])
+    template = BODY_ACHIEVEMENT_FNS.get(tone, BODY_ACHIEVEMENT_FNS[ToneStyle.PROFESSIONAL])
     
-    base = template.format(
+    parts = [template(
         company=current_company,
-        achievement=achievement_text.lower() if achievement_text[0].isupper() else achievement_text,
+        achievement=_lower_first(achievement_text),
         skill_application=skill_app,
-    )
+    )]
     
     # Add second achievement if available
     if len(achievements) > 1:
-        second = achievements[1].strip("•-* ").strip()
-        base += f" Additionally, I {second.lower() if second[0].isupper() else second}."
+        second = _clean_bullet(achievements[1])
+        parts.append(f"Additionally, I {_lower_first(second)}.")
     
-    return base
+    return " ".join(parts)
 
 
 def _generate_skills_paragraph(
@@ -349,7 +387,7 @@ def _generate_skills_paragraph(
         return ""
     
     paragraphs = []
-    template = SKILLS_BRIDGE_TEMPLATES.get(tone, SKILLS_BRIDGE_TEMPLATES[ToneStyle.PROFESSIONAL])
+    template = SKILLS_BRIDGE_FNS.get(tone, SKILLS_BRIDGE_FNS[ToneStyle.PROFESSIONAL])
     
     # Highlight top 2-3 matches
     for match in matches[:2]:
@@ -358,11 +396,11 @@ def _generate_skills_paragraph(
         
         # Clean up evidence
         if evidence:
-            evidence = evidence.strip("•-* ").strip()
+            evidence = _clean_bullet(evidence)
             if len(evidence) > 100:
                 evidence = evidence[:100] + "..."
         
-        para = template.format(skill=skill, evidence=evidence)
+        para = template(skill=skill, evidence=evidence)
         paragraphs.append(para)
     
     return " ".join(paragraphs)
@@ -385,46 +423,66 @@ def _generate_gap_paragraph(
     related = "transferable skills" if not strong_skills else strong_skills[0].get("text", "related areas")
     related_experience = f"I have strong experience with {related}"
     
-    template = GAP_ACKNOWLEDGMENT_TEMPLATES.get(tone, GAP_ACKNOWLEDGMENT_TEMPLATES[ToneStyle.PROFESSIONAL])
+    template = GAP_ACKNOWLEDGMENT_FNS.get(tone, GAP_ACKNOWLEDGMENT_FNS[ToneStyle.PROFESSIONAL])
     
-    return template.format(skill=skill, related_experience=related_experience)
+    return template(skill=skill, related_experience=related_experience)
 
 
 def _generate_closing(company: str, tone: ToneStyle) -> str:
     """Generate closing paragraph."""
-    templates = CLOSING_TEMPLATES.get(tone, CLOSING_TEMPLATES[ToneStyle.PROFESSIONAL])
+    templates = CLOSING_FNS.get(tone, CLOSING_FNS[ToneStyle.PROFESSIONAL])
     template = templates[0]
     
-    return template.format(company=company)
+    return template(company=company)
 
 
 # ═══════════════════════════════════════════════════════════════════════════
 # HELPER FUNCTIONS
 # ═══════════════════════════════════════════════════════════════════════════
 
+def _clean_bullet(text: str) -> str:
+    """Strip bullet markers and surrounding whitespace."""
+    return text.strip("•-* ").strip()
+
+
+def _lower_first(text: str) -> str:
+    """Lower-case only the first letter so a bullet reads mid-sentence."""
+    if text[1:2].isupper():  # Leading acronym, e.g. "AWS migration..."
+        return text
+    return text[:1].lower() + text[1:]
+
+
+# Domain -> job title keywords, checked in priority order (first hit wins)
+_DOMAIN_KEYWORDS = (
+    ("software development", ("software", "developer", "engineer", "programming")),
+    ("project management", ("project manager", "program manager", "scrum master")),
+    ("data analytics", ("data analyst", "data scientist", "analytics")),
+    ("marketing", ("marketing", "brand", "content")),
+    ("sales", ("sales", "account", "business development")),
+    ("design", ("designer", "ux", "ui", "creative")),
+    ("finance", ("finance", "accounting", "financial")),
+    ("human resources", ("hr", "human resources", "recruiter", "talent")),
+    ("operations", ("operations", "supply chain", "logistics")),
+)
+
+
 def _extract_domain(job_title: str, requirements: List[Dict[str, Any]]) -> str:
     """Extract domain/field from job title and requirements."""
     title_lower = job_title.lower()
     
-    domains = {
-        "software development": ["software", "developer", "engineer", "programming"],
-        "project management": ["project manager", "program manager", "scrum master"],
-        "data analytics": ["data analyst", "data scientist", "analytics"],
-        "marketing": ["marketing", "brand", "content"],
-        "sales": ["sales", "account", "business development"],
-        "design": ["designer", "ux", "ui", "creative"],
-        "finance": ["finance", "accounting", "financial"],
-        "human resources": ["hr", "human resources", "recruiter", "talent"],
-        "operations": ["operations", "supply chain", "logistics"],
-    }
-    
-    for domain, keywords in domains.items():
-        if any(kw in title_lower for kw in keywords):
-            return domain
+    for domain, keywords in _DOMAIN_KEYWORDS:
+        for kw in keywords:
+            if kw in title_lower:
+                return domain
     
     return "professional services"
 
 
+def _contains_ignore_case(text: str, needle: str) -> bool:
+    """Case-insensitive substring test; the templates insert names verbatim."""
+    return needle in text or needle.lower() in text.lower()
+
+
 def _calculate_personalization_score(
     company_mentioned: bool,
     job_title_mentioned: bool,
@@ -453,6 +511,13 @@ def _calculate_personalization_score(
     return min(100, score)
 
 
+# Current-employer patterns, tried in order
+_COMPANY_PATTERNS = [
+    re.compile(r'(?:at|@)\s+([A-Z][A-Za-z\s]+?)(?:\s*\||,|\(|$)'),
+    re.compile(r'([A-Z][A-Za-z\s]+?)\s*\|\s*\d{4}'),
+]
+
+
 def extract_resume_data_for_cover_letter(
     resume_text: str,
     scoring_result: Optional[Dict[str, Any]] = None,
@@ -467,32 +532,22 @@ def extract_resume_data_for_cover_letter(
     Returns:
         Dict with extracted resume data
     """
-    import sys
-    import os
-    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    
-    from utils.text_analysis import (
-        extract_name,
-        extract_years_of_experience,
-        extract_metrics,
-    )
-    
     # Extract basic info
     name = extract_name(resume_text)
     years = extract_years_of_experience(resume_text) or 5
     
-    # Extract achievements (lines with metrics)
+    # Extract achievements (lines with metrics); one line often holds several
+    # metrics, so dedupe the cleaned contexts
     metrics = extract_metrics(resume_text)
-    achievements = [m.context for m in metrics[:5]]
+    achievements = list(islice(
+        dict.fromkeys(_clean_bullet(m.context) for m in metrics),
+        MAX_ACHIEVEMENTS,
+    ))
     
     # Try to find current company
     current_company = "my current organization"
-    company_patterns = [
-        r'(?:at|@)\s+([A-Z][A-Za-z\s]+?)(?:\s*\||,|\(|$)',
-        r'([A-Z][A-Za-z\s]+?)\s*\|\s*\d{4}',
-    ]
-    for pattern in company_patterns:
-        match = re.search(pattern, resume_text)
+    for pattern in _COMPANY_PATTERNS:
+        match = pattern.search(resume_text)
         if match:
             current_company = match.group(1).strip()
             break
@@ -539,8 +594,6 @@ def format_cover_letter_response(result: CoverLetterResult) -> Dict[str, Any]:
             "achievements_included": result.achievements_included,
             "customization_notes": result.customization_notes,
         },
-        
-        "copy_ready_text": result.full_text,  # For easy copy/paste
     }
 
 
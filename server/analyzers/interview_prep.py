@@ -13,7 +13,9 @@ File: server/analyzers/interview_prep.py
 from dataclasses import dataclass
 from typing import List, Dict, Any, Optional
 from enum import Enum
+from itertools import islice
 import random
+import re
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -30,7 +32,7 @@ class QuestionCategory(str, Enum):
 
 
 # Behavioral questions (STAR method)
-BEHAVIORAL_TEMPLATES = [
+BEHAVIORAL_TEMPLATES = (
     {
         "template": "Tell me about a time when you {scenario}.",
         "scenarios": [
@@ -58,11 +60,11 @@ BEHAVIORAL_TEMPLATES = [
         ],
         "tip": "Focus on your specific actions and quantify results",
     },
-]
+)
 
 # Technical question patterns by domain
 TECHNICAL_PATTERNS = {
-    "software_engineering": [
+    "software_engineering": (
         "Explain the difference between {tech_a} and {tech_b}.",
         "How would you optimize a slow {component}?",
         "Walk me through how you would design a {system}.",
@@ -71,8 +73,8 @@ TECHNICAL_PATTERNS = {
         "Describe your approach to debugging complex issues.",
         "How do you handle technical debt?",
         "Explain your experience with {methodology}.",
-    ],
-    "project_management": [
+    ),
+    "project_management": (
         "How do you handle scope creep?",
         "Describe your approach to stakeholder management.",
         "How do you prioritize competing demands?",
@@ -80,37 +82,52 @@ TECHNICAL_PATTERNS = {
         "How do you handle underperforming team members?",
         "Describe your risk management process.",
         "How do you communicate project status to executives?",
-    ],
-    "data_analytics": [
+    ),
+    "data_analytics": (
         "How do you approach a new dataset?",
         "Explain a complex analysis you've performed.",
         "How do you communicate findings to non-technical stakeholders?",
         "What's your experience with {tool}?",
         "How do you ensure data quality?",
-    ],
-    "marketing": [
+    ),
+    "marketing": (
         "How do you measure campaign success?",
         "Describe your experience with {channel}.",
         "How do you approach audience segmentation?",
         "What's your process for A/B testing?",
-    ],
-    "sales": [
+    ),
+    "sales": (
         "Walk me through your sales process.",
         "How do you handle objections?",
         "Describe your largest deal.",
         "How do you build long-term client relationships?",
-    ],
-    "general": [
+    ),
+    "general": (
         "What interests you about this role?",
         "Why are you leaving your current position?",
         "Where do you see yourself in 5 years?",
         "What's your greatest professional achievement?",
         "What are your salary expectations?",
-    ],
+    ),
+}
+
+# Placeholder-free questions among each domain's first two patterns, asked as-is
+_GENERIC_TECHNICAL_QUESTIONS = {
+    domain: tuple(p for p in patterns[:2] if "{" not in p and "}" not in p)
+    for domain, patterns in TECHNICAL_PATTERNS.items()
+}
+
+# Patterns that take the candidate's skill directly, with {technology}/{tool}
+# normalized to {skill}; None means ask the generic experience question instead
+_SKILL_QUESTION_TEMPLATES = {
+    p: p.replace("{technology}", "{skill}").replace("{tool}", "{skill}")
+    if any(ph in p for ph in ("{technology}", "{tool}", "{skill}")) else None
+    for patterns in TECHNICAL_PATTERNS.values()
+    for p in patterns
 }
 
 # Gap-based question templates
-GAP_QUESTION_TEMPLATES = [
+GAP_QUESTION_TEMPLATES = (
     {
         "template": "I notice you don't have experience with {skill}. How would you approach learning it?",
         "followup": "What resources would you use?",
@@ -127,20 +144,20 @@ GAP_QUESTION_TEMPLATES = [
         "template": "How would you handle projects involving {skill} given your current experience?",
         "followup": "What support would you need?",
     },
-]
+)
 
 # Experience verification questions
-EXPERIENCE_TEMPLATES = [
+EXPERIENCE_TEMPLATES = (
     "Tell me more about your role at {company}.",
     "What was your biggest accomplishment at {company}?",
     "Why did you leave {company}?",
     "You mentioned {achievement}. Can you elaborate on your specific contribution?",
     "How did you measure success in your {role} position?",
     "What would your manager at {company} say about you?",
-]
+)
 
 # Culture fit questions
-CULTURE_FIT_TEMPLATES = [
+CULTURE_FIT_TEMPLATES = (
     "What type of work environment do you thrive in?",
     "How do you handle feedback?",
     "Describe your ideal manager.",
@@ -148,14 +165,62 @@ CULTURE_FIT_TEMPLATES = [
     "What motivates you professionally?",
     "How do you handle stress and pressure?",
     "What's your approach to collaboration vs. independent work?",
-]
+)
+
+
+# Preparation focus areas by domain
+_DOMAIN_AREAS = {
+    "software_engineering": ("System design fundamentals", "Coding problem-solving approach"),
+    "project_management": ("Project failure recovery stories", "Stakeholder conflict resolution"),
+    "data_analytics": ("Complex analysis case studies", "Data presentation strategies"),
+    "marketing": ("Campaign metrics and ROI", "Brand strategy examples"),
+    "sales": ("Pipeline and quota achievements", "Objection handling scenarios"),
+}
+_DEFAULT_DOMAIN_AREAS = ("General problem-solving examples",)
+
+# Interview tips for every candidate, plus domain-specific extras
+_GENERAL_TIPS = (
+    "Research the company thoroughly - know their products, competitors, and recent news",
+    "Prepare 3-5 STAR stories that showcase different competencies",
+    "Have specific questions ready to ask the interviewer",
+    "Practice your answers out loud, but don't memorize scripts",
+    "Review your resume - be ready to discuss any item in detail",
+)
+_DOMAIN_EXTRA_TIPS = {
+    "software_engineering": (
+        "Be ready for coding challenges - practice on LeetCode or similar",
+        "Prepare to whiteboard or discuss system design",
+    ),
+    "project_management": (
+        "Bring examples of project artifacts if appropriate",
+        "Be ready to discuss methodology preferences and flexibility",
+    ),
+    "data_analytics": (
+        "Prepare to discuss a complex analysis end-to-end",
+        "Be ready for potential case study exercises",
+    ),
+}
+
+
+# Private generator so question picks don't share state with (or get
+# reseeded by) other users of the global random module
+_RNG = random.Random()
+
+_CULTURE_SAMPLE_SIZE = min(3, len(CULTURE_FIT_TEMPLATES))
+
+# Requirement match types that count as "on the resume"
+_MATCHED_TYPES = frozenset({"EXACT", "VARIANT"})
+
+# Job level, by case-insensitive substring ("Team Leader", "SVP" included)
+_SENIOR_TITLE_RE = re.compile("senior|lead|manager|director|principal", re.IGNORECASE)
+_MANAGEMENT_TITLE_RE = re.compile("manager|director|head|vp", re.IGNORECASE)
 
 
 # ═══════════════════════════════════════════════════════════════════════════
 # DATA CLASSES
 # ═══════════════════════════════════════════════════════════════════════════
 
-@dataclass
+@dataclass(slots=True)
 class InterviewQuestion:
     """A generated interview question with metadata."""
     question: str
@@ -167,7 +232,7 @@ class InterviewQuestion:
     related_skill: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class InterviewPrepResult:
     """Complete interview prep package."""
     questions: List[InterviewQuestion]
@@ -231,14 +296,13 @@ def generate_interview_questions(
     
     # Ensure we have enough questions
     while len(questions) < num_questions:
-        questions.extend(_generate_general_questions())
-        questions = questions[:num_questions]
+        questions.extend(_generate_general_questions(num_questions - len(questions)))
     
     # Trim to requested number
     questions = questions[:num_questions]
     
-    # Collect categories covered
-    categories = list(set(q.category for q in questions))
+    # Collect categories covered, in question order (stable across runs)
+    categories = list(dict.fromkeys(q.category for q in questions))
     
     # Identify key areas to prepare
     key_areas = _identify_key_areas(gaps, requirements, domain)
@@ -267,7 +331,7 @@ def _generate_gap_questions(gaps: List[Dict[str, Any]]) -> List[InterviewQuestio
         skill = gap.get("requirement", gap.get("skill", "this skill"))
         
         # Select a random template
-        template_data = random.choice(GAP_QUESTION_TEMPLATES)
+        template_data = _RNG.choice(GAP_QUESTION_TEMPLATES)
         question_text = template_data["template"].format(skill=skill)
         
         questions.append(InterviewQuestion(
@@ -294,20 +358,19 @@ def _generate_technical_questions(
     patterns = TECHNICAL_PATTERNS.get(domain, TECHNICAL_PATTERNS["general"])
     
     # Extract matched skills for technical questions
-    matched_skills = [
-        r.get("text", "") 
-        for r in requirements 
-        if r.get("match_type") in ["EXACT", "VARIANT"]
-    ]
+    matched_skills = (
+        r.get("text", "")
+        for r in requirements
+        if r.get("match_type") in _MATCHED_TYPES
+    )
     
-    for skill in matched_skills[:5]:
+    for skill in islice(matched_skills, 5):
         # Generate skill-specific question
-        pattern = random.choice(patterns)
+        pattern = _RNG.choice(patterns)
         
-        if "{technology}" in pattern or "{tool}" in pattern:
-            question_text = pattern.replace("{technology}", skill).replace("{tool}", skill)
-        elif "{skill}" in pattern:
-            question_text = pattern.format(skill=skill)
+        skill_template = _SKILL_QUESTION_TEMPLATES[pattern]
+        if skill_template is not None:
+            question_text = skill_template.replace("{skill}", skill)
         else:
             question_text = f"Tell me about your experience with {skill}."
         
@@ -321,15 +384,15 @@ def _generate_technical_questions(
         ))
     
     # Add general domain questions
-    for pattern in patterns[:2]:
-        if not any(placeholder in pattern for placeholder in ["{", "}"]):
-            questions.append(InterviewQuestion(
-                question=pattern,
-                category=QuestionCategory.TECHNICAL.value,
-                difficulty="medium",
-                why_asked="Standard technical question for this role type",
-                tip="Have concrete examples ready",
-            ))
+    generic = _GENERIC_TECHNICAL_QUESTIONS.get(domain, _GENERIC_TECHNICAL_QUESTIONS["general"])
+    for pattern in generic:
+        questions.append(InterviewQuestion(
+            question=pattern,
+            category=QuestionCategory.TECHNICAL.value,
+            difficulty="medium",
+            why_asked="Standard technical question for this role type",
+            tip="Have concrete examples ready",
+        ))
     
     return questions
 
@@ -339,8 +402,8 @@ def _generate_behavioral_questions(job_title: str, domain: str) -> List[Intervie
     questions = []
     
     # Determine relevant scenarios based on job level
-    is_senior = any(word in job_title.lower() for word in ["senior", "lead", "manager", "director", "principal"])
-    is_management = any(word in job_title.lower() for word in ["manager", "director", "head", "vp"])
+    is_senior = _SENIOR_TITLE_RE.search(job_title) is not None
+    is_management = _MANAGEMENT_TITLE_RE.search(job_title) is not None
     
     for template_group in BEHAVIORAL_TEMPLATES:
         template = template_group["template"]
@@ -390,12 +453,12 @@ def _generate_experience_questions(requirements: List[Dict[str, Any]]) -> List[I
     questions = []
     
     # Find requirements with evidence to verify
-    verified_skills = [
-        r for r in requirements 
+    verified_skills = (
+        r for r in requirements
         if r.get("match_type") == "EXACT" and r.get("evidence")
-    ]
+    )
     
-    for req in verified_skills[:3]:
+    for req in islice(verified_skills, 3):
         skill = req.get("text", "")
         evidence = req.get("evidence", "")
         
@@ -415,7 +478,7 @@ def _generate_culture_questions() -> List[InterviewQuestion]:
     """Generate culture fit questions."""
     questions = []
     
-    for template in random.sample(CULTURE_FIT_TEMPLATES, min(3, len(CULTURE_FIT_TEMPLATES))):
+    for template in _RNG.sample(CULTURE_FIT_TEMPLATES, _CULTURE_SAMPLE_SIZE):
         questions.append(InterviewQuestion(
             question=template,
             category=QuestionCategory.CULTURE_FIT.value,
@@ -427,12 +490,12 @@ def _generate_culture_questions() -> List[InterviewQuestion]:
     return questions
 
 
-def _generate_general_questions() -> List[InterviewQuestion]:
-    """Generate general interview questions."""
+def _generate_general_questions(count: int = 3) -> List[InterviewQuestion]:
+    """Generate up to `count` distinct general interview questions."""
     questions = []
-    
     general = TECHNICAL_PATTERNS["general"]
-    for template in random.sample(general, min(3, len(general))):
+    
+    for template in _RNG.sample(general, min(count, len(general))):
         questions.append(InterviewQuestion(
             question=template,
             category=QuestionCategory.SITUATIONAL.value,
@@ -448,23 +511,24 @@ def _generate_general_questions() -> List[InterviewQuestion]:
 # HELPER FUNCTIONS
 # ═══════════════════════════════════════════════════════════════════════════
 
+# Domain detection keywords, checked in priority order (first hit wins)
+_DOMAIN_KEYWORDS = (
+    ("software_engineering", ("software", "developer", "engineer", "programming", "code", "backend", "frontend", "full stack", "devops")),
+    ("project_management", ("project manager", "program manager", "scrum", "agile", "pmp", "delivery")),
+    ("data_analytics", ("data analyst", "data scientist", "analytics", "bi ", "business intelligence", "sql", "tableau")),
+    ("marketing", ("marketing", "brand", "campaign", "content", "seo", "social media")),
+    ("sales", ("sales", "account executive", "business development", "revenue")),
+)
+
+
 def _detect_job_domain(job_title: str, requirements: List[Dict[str, Any]]) -> str:
     """Detect the job domain for relevant questions."""
-    title_lower = job_title.lower()
-    all_text = title_lower + " " + " ".join(r.get("text", "").lower() for r in requirements)
-    
-    # Domain detection keywords
-    domains = {
-        "software_engineering": ["software", "developer", "engineer", "programming", "code", "backend", "frontend", "full stack", "devops"],
-        "project_management": ["project manager", "program manager", "scrum", "agile", "pmp", "delivery"],
-        "data_analytics": ["data analyst", "data scientist", "analytics", "bi ", "business intelligence", "sql", "tableau"],
-        "marketing": ["marketing", "brand", "campaign", "content", "seo", "social media"],
-        "sales": ["sales", "account executive", "business development", "revenue"],
-    }
+    all_text = " ".join([job_title, *[r.get("text", "") for r in requirements]]).lower()
     
-    for domain, keywords in domains.items():
-        if any(kw in all_text for kw in keywords):
-            return domain
+    for domain, keywords in _DOMAIN_KEYWORDS:
+        for kw in keywords:
+            if kw in all_text:
+                return domain
     
     return "general"
 
@@ -484,49 +548,25 @@ def _identify_key_areas(
             areas.append(f"Prepare to discuss how you'd learn {skill}")
     
     # Add strong skill areas
-    strong_skills = [
-        r.get("text", "") 
-        for r in requirements 
+    strong_skills = (
+        r.get("text", "")
+        for r in requirements
         if r.get("match_type") == "EXACT" and r.get("tier") == 1
-    ][:3]
+    )
     
-    for skill in strong_skills:
+    for skill in islice(strong_skills, 3):
         areas.append(f"Prepare detailed examples using {skill}")
     
     # Add domain-specific areas
-    domain_areas = {
-        "software_engineering": ["System design fundamentals", "Coding problem-solving approach"],
-        "project_management": ["Project failure recovery stories", "Stakeholder conflict resolution"],
-        "data_analytics": ["Complex analysis case studies", "Data presentation strategies"],
-        "marketing": ["Campaign metrics and ROI", "Brand strategy examples"],
-        "sales": ["Pipeline and quota achievements", "Objection handling scenarios"],
-    }
-    
-    areas.extend(domain_areas.get(domain, ["General problem-solving examples"])[:2])
+    areas.extend(_DOMAIN_AREAS.get(domain, _DEFAULT_DOMAIN_AREAS)[:2])
     
     return areas[:7]
 
 
 def _get_general_tips(job_title: str, domain: str) -> List[str]:
     """Get general interview preparation tips."""
-    tips = [
-        "Research the company thoroughly - know their products, competitors, and recent news",
-        "Prepare 3-5 STAR stories that showcase different competencies",
-        "Have specific questions ready to ask the interviewer",
-        "Practice your answers out loud, but don't memorize scripts",
-        "Review your resume - be ready to discuss any item in detail",
-    ]
-    
-    # Add domain-specific tips
-    if domain == "software_engineering":
-        tips.append("Be ready for coding challenges - practice on LeetCode or similar")
-        tips.append("Prepare to whiteboard or discuss system design")
-    elif domain == "project_management":
-        tips.append("Bring examples of project artifacts if appropriate")
-        tips.append("Be ready to discuss methodology preferences and flexibility")
-    elif domain == "data_analytics":
-        tips.append("Prepare to discuss a complex analysis end-to-end")
-        tips.append("Be ready for potential case study exercises")
+    tips = list(_GENERAL_TIPS)
+    tips.extend(_DOMAIN_EXTRA_TIPS.get(domain, ()))
     
     return tips[:7]
 
@@ -545,19 +585,30 @@ def format_interview_prep(result: InterviewPrepResult) -> Dict[str, Any]:
     Returns:
         Dict ready for JSON serialization
     """
-    # Group questions by category
+    # Single pass: group by category, flatten, and count difficulties
     questions_by_category = {}
+    all_questions = []
+    difficulty_breakdown = {"easy": 0, "medium": 0, "hard": 0}
     for q in result.questions:
-        if q.category not in questions_by_category:
-            questions_by_category[q.category] = []
-        questions_by_category[q.category].append({
+        questions_by_category.setdefault(q.category, []).append({
+            "question": q.question,
+            "difficulty": q.difficulty,
+            "why_asked": q.why_asked,
+            "tip": q.tip,
+            "followup": q.followup,
+            "related_skill": q.related_skill,
+        })
+        all_questions.append({
             "question": q.question,
+            "category": q.category,
             "difficulty": q.difficulty,
             "why_asked": q.why_asked,
             "tip": q.tip,
             "followup": q.followup,
             "related_skill": q.related_skill,
         })
+        if q.difficulty in difficulty_breakdown:
+            difficulty_breakdown[q.difficulty] += 1
     
     return {
         "question_count": result.question_count,
@@ -565,27 +616,12 @@ def format_interview_prep(result: InterviewPrepResult) -> Dict[str, Any]:
         
         "questions_by_category": questions_by_category,
         
-        "all_questions": [
-            {
-                "question": q.question,
-                "category": q.category,
-                "difficulty": q.difficulty,
-                "why_asked": q.why_asked,
-                "tip": q.tip,
-                "followup": q.followup,
-                "related_skill": q.related_skill,
-            }
-            for q in result.questions
-        ],
+        "all_questions": all_questions,
         
         "key_areas_to_prepare": result.key_areas_to_prepare,
         "general_tips": result.general_tips,
         
-        "difficulty_breakdown": {
-            "easy": len([q for q in result.questions if q.difficulty == "easy"]),
-            "medium": len([q for q in result.questions if q.difficulty == "medium"]),
-            "hard": len([q for q in result.questions if q.difficulty == "hard"]),
-        },
+        "difficulty_breakdown": difficulty_breakdown,
     }
 
 
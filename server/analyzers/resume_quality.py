@@ -10,23 +10,15 @@ Analyzes resume quality independent of job matching:
 File: server/analyzers/resume_quality.py
 """
 
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional
-import sys
-import os
-
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import hashlib
+import threading
 
 from utils.text_analysis import (
-    extract_metrics,
-    extract_metrics_simple,
-    analyze_action_verbs,
-    get_text_stats,
-    extract_name,
-    extract_email,
-    extract_phone,
-    extract_skills_section,
+    scan_resume,
+    ResumeScan,
     POWER_VERBS,
     WEAK_VERBS,
     MetricMatch,
@@ -69,7 +61,7 @@ QUALITY_CONFIG = {
 # DATA CLASSES
 # ═══════════════════════════════════════════════════════════════════════════
 
-@dataclass
+@dataclass(slots=True)
 class QualityDimension:
     """Score for a single quality dimension."""
     name: str
@@ -80,7 +72,7 @@ class QualityDimension:
     suggestions: List[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class ResumeQualityResult:
     """Complete resume quality analysis result."""
     overall_score: int
@@ -108,40 +100,74 @@ class ResumeQualityResult:
 # MAIN ANALYSIS FUNCTION
 # ═══════════════════════════════════════════════════════════════════════════
 
+# The same resume is re-scored for every job it is tailored against, so keep
+# a small LRU of recent results. Locked because the analyzer pool and Flask
+# threads share it. Cached results are shared: treat them as read-only.
+QUALITY_CACHE_MAX_ENTRIES = 256
+_quality_cache: OrderedDict[str, ResumeQualityResult] = OrderedDict()
+_quality_cache_lock = threading.Lock()
+
+
 def analyze_resume_quality(resume_text: str) -> ResumeQualityResult:
     """
     Analyze resume quality independent of job matching.
     
+    Results are cached by a digest of the text; repeat calls return the
+    same (read-only) result object.
+    
     Args:
         resume_text: Full resume text
         
     Returns:
         ResumeQualityResult with scores, findings, and suggestions
     """
+    cache_key = hashlib.blake2b(resume_text.encode(), digest_size=16).hexdigest()
+    with _quality_cache_lock:
+        cached = _quality_cache.get(cache_key)
+        if cached is not None:
+            _quality_cache.move_to_end(cache_key)
+            return cached
+    
+    result = _analyze_resume_quality(resume_text)
     
-    # Extract all data
-    metrics = extract_metrics(resume_text)
-    metrics_simple = extract_metrics_simple(resume_text)
-    verb_analysis = analyze_action_verbs(resume_text)
-    text_stats = get_text_stats(resume_text)
-    skills = extract_skills_section(resume_text)
+    with _quality_cache_lock:
+        _quality_cache[cache_key] = result
+        if len(_quality_cache) > QUALITY_CACHE_MAX_ENTRIES:
+            _quality_cache.popitem(last=False)
+    return result
+
+
+def clear_quality_cache() -> None:
+    """Clear the quality result cache (for testing)."""
+    with _quality_cache_lock:
+        _quality_cache.clear()
+
+
+def _analyze_resume_quality(resume_text: str) -> ResumeQualityResult:
+    """Uncached analyze_resume_quality()."""
+    # Extract all data in one scan
+    scan = scan_resume(resume_text)
+    metrics = scan.metrics
+    verb_analysis = scan.verb_analysis
+    text_stats = scan.text_stats
+    skills = scan.skills
     
     # Contact info
-    has_name = extract_name(resume_text) is not None
-    has_email = extract_email(resume_text) is not None
-    has_phone = extract_phone(resume_text) is not None
+    has_name = scan.name is not None
+    has_email = scan.email is not None
+    has_phone = scan.phone is not None
     
     # Analyze each dimension
     dimensions = {}
     
     # 1. Metrics/Quantification
-    dimensions["metrics"] = _analyze_metrics_dimension(metrics, metrics_simple)
+    dimensions["metrics"] = _analyze_metrics_dimension(metrics, scan.metrics_by_type)
     
     # 2. Action Verbs
     dimensions["action_verbs"] = _analyze_verbs_dimension(verb_analysis)
     
     # 3. Structure
-    dimensions["structure"] = _analyze_structure_dimension(text_stats, resume_text)
+    dimensions["structure"] = _analyze_structure_dimension(text_stats, scan)
     
     # 4. Completeness
     dimensions["completeness"] = _analyze_completeness_dimension(
@@ -190,7 +216,7 @@ def analyze_resume_quality(resume_text: str) -> ResumeQualityResult:
 
 def _analyze_metrics_dimension(
     metrics: List[MetricMatch], 
-    metrics_simple: Dict[str, List[str]]
+    metrics_by_type: Dict[str, List[str]]
 ) -> QualityDimension:
     """Analyze quantified achievements."""
     
@@ -222,8 +248,8 @@ def _analyze_metrics_dimension(
         findings.append(f"Strong: {count} quantified achievements found")
     
     # Check metric types
-    has_percentage = len(metrics_simple.get("percentage", [])) > 0
-    has_dollar = len(metrics_simple.get("dollar_amount", [])) > 0
+    has_percentage = len(metrics_by_type.get("percentage", [])) > 0
+    has_dollar = len(metrics_by_type.get("dollar_amount", [])) > 0
     
     if not has_percentage:
         suggestions.append("Add percentage improvements (e.g., 'reduced costs by 25%')")
@@ -298,7 +324,7 @@ def _analyze_verbs_dimension(verb_analysis: VerbAnalysis) -> QualityDimension:
     )
 
 
-def _analyze_structure_dimension(text_stats: TextStats, resume_text: str) -> QualityDimension:
+def _analyze_structure_dimension(text_stats: TextStats, scan: ResumeScan) -> QualityDimension:
     """Analyze resume structure and formatting."""
     
     findings = []
@@ -331,10 +357,9 @@ def _analyze_structure_dimension(text_stats: TextStats, resume_text: str) -> Qua
         suggestions.append("Use bullet points for achievements and responsibilities")
     
     # Check for common sections
-    resume_lower = resume_text.lower()
-    has_experience = "experience" in resume_lower
-    has_education = "education" in resume_lower
-    has_skills = "skills" in resume_lower or "technologies" in resume_lower
+    has_experience = scan.has_experience
+    has_education = scan.has_education
+    has_skills = scan.has_skills
     
     if all([has_experience, has_education, has_skills]):
         score += 5
@@ -485,29 +510,30 @@ def _get_status(score: int) -> str:
 def _prioritize_suggestions(dimensions: Dict[str, QualityDimension]) -> List[Dict[str, Any]]:
     """Collect and prioritize suggestions from all dimensions."""
     
-    all_suggestions = []
+    top_suggestions = []
     
     # Priority order based on impact
-    priority_order = ["metrics", "action_verbs", "completeness", "structure", "length"]
+    priority_order = ("metrics", "action_verbs", "completeness", "structure", "length")
     
     for dim_name in priority_order:
-        dim = dimensions.get(dim_name)
-        if not dim:
-            continue
-            
+        dim = dimensions[dim_name]  # analyze_resume_quality always builds all five
+        
         # Only include suggestions from dimensions that need improvement
         if dim.score < 80:
+            priority = "high" if dim.score < 50 else "medium" if dim.score < 70 else "low"
+            impact = f"+{max(5, (100 - dim.score) // 4)} potential points"
             for suggestion in dim.suggestions:
-                priority = "high" if dim.score < 50 else "medium" if dim.score < 70 else "low"
-                all_suggestions.append({
+                top_suggestions.append({
                     "category": dim.name,
                     "suggestion": suggestion,
                     "priority": priority,
-                    "impact": f"+{max(5, (100 - dim.score) // 4)} potential points",
+                    "impact": impact,
                 })
+                # Return top 5 suggestions; later ones would be discarded
+                if len(top_suggestions) == 5:
+                    return top_suggestions
     
-    # Return top 5 suggestions
-    return all_suggestions[:5]
+    return top_suggestions
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -128,6 +128,12 @@ ROLE_LEVEL_PATTERNS = {
     ],
 }
 
+# One compiled alternation per level, checked in the same order
+_ROLE_LEVEL_RES = [
+    (level, re.compile("|".join(patterns)))
+    for level, patterns in ROLE_LEVEL_PATTERNS.items()
+]
+
 LEVEL_HIERARCHY = ["entry", "mid", "senior", "director", "executive"]
 
 
@@ -135,10 +141,9 @@ def detect_role_level(title: str) -> str:
     """Detect the seniority level of a role from its title."""
     title_lower = title.lower()
     
-    for level, patterns in ROLE_LEVEL_PATTERNS.items():
-        for pattern in patterns:
-            if re.search(pattern, title_lower):
-                return level
+    for level, pattern in _ROLE_LEVEL_RES:
+        if pattern.search(title_lower):
+            return level
     
     # Default to mid-level if unclear
     return "mid"
@@ -1,4 +1,5 @@
 from flask import Flask, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
@@ -11,6 +12,12 @@ import requests
 from datetime import datetime, timezone
 from dotenv import load_dotenv
 
+# orjson is an optional, faster encoder for API responses
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
 # Import AI engine
 from ai_engine import analyze_resume
 
@@ -45,6 +52,25 @@ validate_env()
 
 app = Flask(__name__)
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Encode compact JSON responses with orjson; pretty-printing falls back to json."""
+
+    _OPTIONS = (
+        orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if orjson else 0
+    )
+
+    def dumps(self, obj, **kwargs):
+        if set(kwargs) - {"separators"}:  # e.g. indent in debug mode
+            return super().dumps(obj, **kwargs)
+        # Datetimes pass through to Flask's default so their format is unchanged
+        return orjson.dumps(obj, default=self.default, option=self._OPTIONS).decode()
+
+
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
 # CORS configuration - allow requests from your frontend domain
 # In production, replace with your actual frontend URL
 CORS(app, resources={
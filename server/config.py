@@ -32,7 +32,9 @@ def validate_env():
 
     # Optional with defaults — log for visibility
     defaults = {
-        "OPENAI_MODEL": "gpt-4o",
+        "OPENAI_MODEL": "gpt-4o-mini",
+        "OPENAI_MODEL_FALLBACK": "gpt-4o",
+        "OPENAI_MODEL_MINI": "gpt-4o-mini",
         "GUEST_CREDITS_TOTAL": "3",
         "REG_CREDITS_TOTAL": "7",
     }
@@ -903,6 +903,52 @@ def generate_evaluation(
     )
 
 
+def format_evaluation(evaluation: EvaluationResult) -> Dict[str, Any]:
+    """Format an EvaluationResult as the nested dict the frontend expects."""
+    return {
+        "hiring": {
+            "status": evaluation.hiring_status,
+            "summary": evaluation.hiring_summary,
+            "reassurance": evaluation.hiring_reassurance,
+        },
+        "ats": {
+            "status": evaluation.ats_status,
+            "checks": evaluation.ats_checks,
+            "summary": evaluation.ats_summary,
+        },
+        "search": {
+            "status": evaluation.search_status,
+            "matched": evaluation.search_matched,
+            "total": evaluation.search_total,
+            "terms": evaluation.searchable_terms,
+            "summary": evaluation.search_summary,
+        },
+        "alignment": {
+            "score": evaluation.alignment_score,
+            "label": evaluation.alignment_label,
+            "strengths": evaluation.alignment_strengths,
+            "refinements": evaluation.alignment_refinements,
+        },
+        "readability": {
+            "label": evaluation.readability_label,
+            "notes": evaluation.readability_notes,
+        },
+        "roleMisalignment": {
+            "detected": evaluation.has_role_misalignment,
+            "severity": evaluation.misalignment_severity,
+            "reasons": evaluation.misalignment_reasons,
+            "rewritingCanHelp": evaluation.rewriting_can_help,
+            "rewritingCannotFix": evaluation.rewriting_cannot_fix,
+            "alternativeRoles": evaluation.alternative_roles,
+        },
+        "verdict": {
+            "ready_to_submit": evaluation.ready_to_submit,
+            "message": evaluation.verdict_message,
+            "stop_optimizing": evaluation.stop_optimizing,
+        },
+    }
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # OPTIMIZATION PLAN GENERATOR
 # ═══════════════════════════════════════════════════════════════════════════
@@ -0,0 +1,581 @@
+"""Tests for AI engine helpers that don't call OpenAI."""
+
+import json
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+import tenacity
+
+import ai_engine
+
+
+class FakeStream:
+    """Minimal stand-in for an OpenAI chat completion stream."""
+
+    def __init__(self, pieces):
+        self.chunks = [
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))], usage=None)
+            for piece in pieces
+        ]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def __iter__(self):
+        return iter(self.chunks)
+
+
+def test_cache_key_depends_on_model():
+    key_a = ai_engine._get_cache_key("resume", "job", "gpt-4o")
+    key_b = ai_engine._get_cache_key("resume", "job", "gpt-4o-mini")
+    assert key_a != key_b
+
+
+def test_cache_key_ignores_surrounding_whitespace():
+    key_a = ai_engine._get_cache_key("resume", "job", "gpt-4o")
+    key_b = ai_engine._get_cache_key("  resume\n", "job  ", "gpt-4o")
+    assert key_a == key_b
+
+
+def test_extraction_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(ai_engine, "EXTRACTION_CACHE_MAX_ENTRIES", 2)
+    ai_engine.clear_cache()
+
+    ai_engine._cache_extraction("a", {"n": 1})
+    ai_engine._cache_extraction("b", {"n": 2})
+    ai_engine._get_cached_extraction("a")  # "b" is now least recently used
+    ai_engine._cache_extraction("c", {"n": 3})
+
+    assert ai_engine._get_cached_extraction("b") is None
+    assert ai_engine._get_cached_extraction("a")["n"] == 1
+    ai_engine.clear_cache()
+
+
+def test_expired_extractions_are_not_reused(tmp_path, monkeypatch):
+    monkeypatch.setattr(ai_engine, "AI_CACHE_ENABLED", True)
+    monkeypatch.setattr(ai_engine, "AI_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+    ai_engine.clear_cache()
+
+    ai_engine._cache_extraction("old", {"requirements": [], "_cached_at": 0})
+
+    assert ai_engine._get_cached_extraction("old") is None
+    ai_engine._extraction_cache.clear()
+    assert ai_engine._get_cached_extraction("old") is None
+
+def test_cache_key_hashes_prompt_model_and_inputs():
+    combined = f"{ai_engine.EXTRACTION_PROMPT}|||gpt-4o|||resume|||job"
+    expected = ai_engine.hashlib.blake2b(combined.encode(), digest_size=16).hexdigest()
+    assert ai_engine._get_cache_key(" resume ", "job", "gpt-4o") == expected
+
+def test_persistent_cache_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(ai_engine, "AI_CACHE_ENABLED", True)
+    monkeypatch.setattr(ai_engine, "AI_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+    extraction = {"requirements": [], "experience": {}, "gaps": []}
+
+    ai_engine._cache_extraction("abc", extraction)
+    ai_engine._extraction_cache.clear()  # Simulate a fresh process
+
+    assert ai_engine._get_cached_extraction("abc") == extraction
+    ai_engine.clear_cache()
+    assert ai_engine._get_cached_extraction("abc") is None
+
+
+def test_embeddings_are_cached_by_content(tmp_path, monkeypatch):
+    monkeypatch.setattr(ai_engine, "AI_CACHE_ENABLED", True)
+    monkeypatch.setattr(ai_engine, "AI_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+    ai_engine.clear_cache()
+    calls = []
+
+    def fake_embed(**kwargs):
+        calls.append(kwargs)
+        return SimpleNamespace(data=[SimpleNamespace(embedding=[3.0, 4.0])])
+
+    monkeypatch.setattr(ai_engine.client.embeddings, "create", fake_embed)
+
+    first = ai_engine._embed_analysis_input("resume", "job")
+    ai_engine._embedding_cache.clear()  # Simulate a fresh process
+    second = ai_engine._embed_analysis_input("resume ", "job")
+
+    assert len(calls) == 1
+    assert first.tolist() == second.tolist() == [0.6000000238418579, 0.800000011920929]
+    ai_engine.clear_cache()
+
+def test_semantic_lookup_matches_near_duplicate(monkeypatch):
+    ai_engine.clear_cache()
+    extraction = {"requirements": [], "experience": {}, "gaps": []}
+    stored = ai_engine.np.array([1.0, 0.0, 0.0], dtype=ai_engine.np.float32)
+    near = ai_engine.np.array([0.99, 0.1, 0.0], dtype=ai_engine.np.float32)
+    near /= ai_engine.np.linalg.norm(near)
+
+    ai_engine._cache_extraction("stored", extraction)
+    ai_engine._add_to_semantic_index("stored", stored, "gpt-4o")
+    monkeypatch.setattr(ai_engine, "_embed_analysis_input", lambda r, j: near)
+
+    cached, embedding = ai_engine.semantic_lookup("resume", "job", "gpt-4o")
+    assert cached == extraction
+    assert embedding is near
+
+    # Different model never reuses another model's extraction
+    cached, _ = ai_engine.semantic_lookup("resume", "job", "gpt-4o-mini")
+    assert cached is None
+    ai_engine.clear_cache()
+
+
+SAMPLE_RESUME = "Backend developer with five years of Python, PostgreSQL and Docker experience."
+
+SAMPLE_EXTRACTION = {
+    "requirements": [
+        {"text": "Python", "tier": 1, "match_type": "EXACT", "evidence": "5 years Python"},
+        {"text": "AWS", "tier": 2, "match_type": "NONE", "evidence": None},
+    ],
+    "experience": {"required_years": 3, "candidate_years": 5, "seniority_signals": []},
+    "gaps": [{"requirement": "AWS", "suggestion": "Add cloud experience"}],
+    "job_title": "Backend Engineer",
+    "company_name": "Acme",
+}
+
+
+def test_analyze_resumes_batch_preserves_order(monkeypatch):
+    async def fake_extract(resume_text, job_text, openai_client):
+        if resume_text.startswith("boom"):
+            raise RuntimeError("upstream failure")
+        return SAMPLE_EXTRACTION
+
+    monkeypatch.setattr(ai_engine, "_extract_requirements_async", fake_extract)
+    pairs = [
+        (SAMPLE_RESUME, "Backend engineer role"),
+        ("boom " + SAMPLE_RESUME, "Backend engineer role"),
+        (SAMPLE_RESUME, "Backend engineer role"),
+    ]
+
+    results = ai_engine.asyncio.run(ai_engine.analyze_resumes_batch(pairs, concurrency=2))
+
+    assert len(results) == 3
+    assert results[0]["scoring_method"] == "hybrid_v2"
+    assert results[1]["interpretation"] == "ERROR"
+    assert results[2]["scoring_method"] == "hybrid_v2"
+
+
+def test_create_completion_retries_transient_errors(monkeypatch):
+    calls = []
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+    def flaky_create(**kwargs):
+        calls.append(kwargs)
+        if len(calls) < 3:
+            raise ai_engine.openai.APIConnectionError(request=request)
+        return FakeStream(['{"ok": ', "true}"])
+
+    monkeypatch.setattr(ai_engine.client.chat.completions, "create", flaky_create)
+    monkeypatch.setattr(ai_engine._create_completion.retry, "sleep", lambda seconds: None)
+
+    assert ai_engine._create_completion(model="gpt-4o") == '{"ok": true}'
+    assert len(calls) == 3
+    assert calls[0]["timeout"] == ai_engine.OPENAI_TIMEOUT_SECONDS
+    assert calls[0]["stream"] is True
+
+
+SHORT_JOB = """Backend Engineer
+
+Requirements:
+- 3+ years of Python
+- Experience with PostgreSQL
+- Familiarity with Docker
+"""
+
+
+def test_pick_model_routes_short_structured_jobs_to_mini():
+    assert ai_engine.pick_model("Short resume", SHORT_JOB) == ai_engine.OPENAI_MODEL_MINI
+
+
+def test_pick_model_uses_primary_for_long_or_unstructured_jobs(monkeypatch):
+    monkeypatch.setenv("OPENAI_MODEL", "gpt-4o")
+    assert ai_engine.pick_model("x" * 6000, SHORT_JOB) == "gpt-4o"
+    assert ai_engine.pick_model("Short resume", "We need a Python engineer.") == "gpt-4o"
+
+
+def test_extract_required_skills_reads_bulleted_block():
+    skills = ai_engine.extract_required_skills(SHORT_JOB)
+    assert skills == ["3+ years of Python", "Experience with PostgreSQL", "Familiarity with Docker"]
+
+
+def test_extract_required_skills_ignores_inline_mentions():
+    job = "Work with product managers to define requirements.\n- Ship features\n"
+    assert ai_engine.extract_required_skills(job) == []
+
+
+def test_validate_extraction_response_fills_defaults():
+    result = {"requirements": [{"text": "Python"}]}
+    ai_engine.validate_extraction_response(result)
+
+    assert result["gaps"] == []
+    assert result["experience"]["candidate_years"] == 0
+    assert result["requirements"][0] == {"text": "Python", "tier": 2, "match_type": "NONE"}
+
+
+def test_prescore_measures_job_vocabulary_overlap():
+    assert ai_engine.prescore("Python and Docker developer", "Python, Docker, Kubernetes") == 2 / 3
+    assert ai_engine.prescore("anything", "") == 1.0
+
+
+def test_prescore_ignores_punctuation_and_keeps_accents():
+    assert ai_engine.prescore("Python developer.", "Requirements: Python.") == 1 / 2
+    assert ai_engine._tokenize("Comunicación efectiva, C++ y Node.js.") == {
+        "comunicación", "efectiva", "c++", "node.js",
+    }
+    assert ai_engine.prescore("Excelente comunicación", "comunicación") == 1.0
+
+
+def test_low_overlap_skips_ai_extraction(monkeypatch):
+    def fail(**kwargs):
+        raise AssertionError("OpenAI should not be called")
+
+    monkeypatch.setattr(ai_engine, "PRESCORE_FLOOR", 0.05)
+    monkeypatch.setattr(ai_engine, "_create_completion", fail)
+    job = SHORT_JOB + " ".join(f"skill{chr(97 + i)}{chr(97 + j)}" for i in range(6) for j in range(6))
+    extraction = ai_engine._extract_requirements("Pastry chef, croissants, sourdough", job)
+
+    assert extraction["requirements"][0] == {
+        "text": "3+ years of Python", "tier": 1, "match_type": "NONE", "evidence": ""
+    }
+
+
+SPANISH_JOB = """Ingeniero Backend Senior
+
+Buscamos una persona ingeniera con amplia experiencia construyendo servicios
+escalables en la nube. Trabajarás junto al equipo de producto diseñando
+interfaces, bases de datos relacionales, contenedores y despliegues
+automatizados. Valoramos liderazgo técnico, mentoría, comunicación clara,
+documentación rigurosa y pasión por la calidad del software.
+"""
+
+
+def test_cross_language_pair_still_calls_ai(monkeypatch):
+    resume = "Backend developer, 8 years of Python, Django, PostgreSQL, Docker and AWS."
+    assert ai_engine.prescore(resume, SPANISH_JOB) < 0.05
+    assert not ai_engine._should_skip_extraction(resume, SPANISH_JOB)
+
+    # Even with the floor enabled, a posting without a requirements block
+    # goes to the model rather than producing an empty "no match" result
+    monkeypatch.setattr(ai_engine, "PRESCORE_FLOOR", 0.05)
+    assert not ai_engine._should_skip_extraction(resume, SPANISH_JOB)
+
+
+def test_retry_cycles_fit_the_worker_budget(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(tenacity, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+
+    def time_out(**kwargs):
+        clock[0] += ai_engine.OPENAI_TIMEOUT_SECONDS
+        raise openai.APITimeoutError(request=httpx.Request("POST", "https://api.openai.com"))
+
+    def sleep(seconds):
+        clock[0] += seconds
+
+    monkeypatch.setattr(ai_engine.client.chat.completions, "create", time_out)
+    create = ai_engine._create_completion.retry_with(sleep=sleep)
+    for _ in range(2):  # Primary model, then the invalid-JSON fallback
+        with pytest.raises(openai.APITimeoutError):
+            create(model="gpt-4o-mini", messages=[])
+
+    assert clock[0] + ai_engine.EMBEDDING_TIMEOUT_SECONDS <= ai_engine.OPENAI_TOTAL_BUDGET_SECONDS
+
+
+def test_clip_to_tokens_only_truncates_long_text():
+    assert ai_engine.clip_to_tokens("short resume", 100) == "short resume"
+
+    long_text = "experience " * 2000
+    clipped = ai_engine.clip_to_tokens(long_text, 100)
+    assert len(clipped) < len(long_text)
+    assert long_text.startswith(clipped)
+
+
+def test_encoder_loads_once_under_concurrent_first_calls(monkeypatch):
+    loads = []
+
+    def slow_get_encoding(name):
+        loads.append(name)
+        time.sleep(0.05)
+        return SimpleNamespace(name=name)
+
+    monkeypatch.setitem(sys.modules, "tiktoken", SimpleNamespace(get_encoding=slow_get_encoding))
+    monkeypatch.setattr(ai_engine, "_encoder", None)
+    monkeypatch.setattr(ai_engine, "_encoder_loaded", False)
+
+    encoders = []
+    threads = [threading.Thread(target=lambda: encoders.append(ai_engine._get_encoder())) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert loads == ["o200k_base"]
+    assert len(encoders) == 4 and all(encoder is encoders[0] is not None for encoder in encoders)
+
+
+def test_split_extraction_merges_both_calls(monkeypatch):
+    def fake_create(**kwargs):
+        if "TASK 4 only" in kwargs["messages"][-1]["content"]:
+            assert kwargs["model"] == ai_engine.OPENAI_MODEL_MINI
+            return '{"gaps": [], "job_title": "Backend Engineer", "summary": "Good fit."}'
+        return json.dumps({
+            "requirements": SAMPLE_EXTRACTION["requirements"],
+            "experience": SAMPLE_EXTRACTION["experience"],
+        })
+
+    monkeypatch.setattr(ai_engine, "SPLIT_EXTRACTION_ENABLED", True)
+    monkeypatch.setattr(ai_engine, "_create_completion", fake_create)
+    monkeypatch.setattr(ai_engine, "_lookup_extraction", lambda *args: ("key", None, None))
+    monkeypatch.setattr(ai_engine, "_store_extraction", lambda *args: None)
+
+    extraction = ai_engine._extract_requirements("Python developer resume", SHORT_JOB)
+
+    assert extraction["requirements"] == SAMPLE_EXTRACTION["requirements"]
+    assert extraction["job_title"] == "Backend Engineer"
+    assert extraction["gaps"] == []
+
+
+def test_error_responses_do_not_share_state():
+    first = ai_engine.create_error_response("boom")
+    first["quick_wins"].append({"title": "mutated"})
+
+    second = ai_engine.create_error_response("boom")
+    assert second["error"] == "Analysis failed: boom"
+    assert len(second["quick_wins"]) == 1
+
+
+def test_extraction_result_defaults_blank_titles():
+    extraction = ai_engine.ExtractionResult.from_dict({**SAMPLE_EXTRACTION, "job_title": None})
+
+    assert extraction.job_title == ""
+    assert extraction.requirements == SAMPLE_EXTRACTION["requirements"]
+    assert not hasattr(extraction, "__dict__")
+
+
+def test_batch_api_round_trip(monkeypatch):
+    uploaded = {}
+
+    def fake_upload(file, purpose):
+        uploaded["lines"] = [json.loads(line) for line in file[1].decode().splitlines()]
+        return SimpleNamespace(id="file-in")
+
+    output_line = json.dumps({
+        "custom_id": "pair-0",
+        "response": {
+            "status_code": 200,
+            "body": {"choices": [{"message": {"content": json.dumps(SAMPLE_EXTRACTION)}}]},
+        },
+    })
+    monkeypatch.setattr(ai_engine.client.files, "create", fake_upload)
+    monkeypatch.setattr(ai_engine.client.files, "content", lambda file_id: SimpleNamespace(text=output_line))
+    monkeypatch.setattr(ai_engine.client.batches, "create", lambda **kwargs: SimpleNamespace(id="batch-1"))
+    monkeypatch.setattr(
+        ai_engine.client.batches,
+        "retrieve",
+        lambda batch_id: SimpleNamespace(status="completed", output_file_id="file-out"),
+    )
+
+    pairs = [(SAMPLE_RESUME, SHORT_JOB), (SAMPLE_RESUME + " Also Go.", SHORT_JOB)]
+    assert ai_engine.submit_analysis_batch(pairs) == "batch-1"
+    assert uploaded["lines"][1]["custom_id"] == "pair-1"
+    assert uploaded["lines"][0]["body"]["prompt_cache_key"] == ai_engine.PROMPT_CACHE_KEY
+
+    results = ai_engine.collect_batch_results("batch-1", pairs, include_quality_analysis=False)
+    assert results[0]["scoring_method"] == "hybrid_v2"
+    assert results[1]["interpretation"] == "ERROR"
+    ai_engine.clear_cache()
+
+
+def test_submit_analysis_batch_rejects_no_valid_pairs(monkeypatch):
+    def fail(**kwargs):
+        raise AssertionError("nothing should be uploaded")
+
+    monkeypatch.setattr(ai_engine.client.files, "create", fail)
+    monkeypatch.setattr(ai_engine.client.batches, "create", fail)
+
+    for pairs in ([], [("", SHORT_JOB)]):
+        with pytest.raises(ValueError, match="no valid pairs"):
+            ai_engine.submit_analysis_batch(pairs)
+
+
+def test_invalid_json_retries_with_fallback_model(monkeypatch):
+    models = []
+
+    def fake_create(**kwargs):
+        models.append(kwargs["model"])
+        return "not json" if len(models) == 1 else json.dumps(SAMPLE_EXTRACTION)
+
+    monkeypatch.setattr(ai_engine, "_create_completion", fake_create)
+    monkeypatch.setattr(ai_engine, "_lookup_extraction", lambda *args: ("key", None, None))
+    monkeypatch.setattr(ai_engine, "_store_extraction", lambda *args: None)
+
+    extraction = ai_engine._extract_requirements("Python developer resume", SHORT_JOB)
+
+    assert models == [ai_engine.OPENAI_MODEL_MINI, ai_engine.OPENAI_MODEL_FALLBACK]
+    assert extraction["requirements"] == SAMPLE_EXTRACTION["requirements"]
+
+
+def test_few_shot_example_is_valid_extraction_json():
+    example = json.loads(ai_engine.FEW_SHOT_MESSAGES[1]["content"])
+    assert {"requirements", "experience", "gaps"} <= example.keys()
+
+
+def test_senior_role_detection_matches_substrings_case_insensitively():
+    assert ai_engine._SENIOR_ROLE_RE.search("Engineering LEADERSHIP role")
+    assert ai_engine._SENIOR_ROLE_RE.search("Staff Engineer")
+    assert not ai_engine._SENIOR_ROLE_RE.search("Junior developer")
+
+
+def test_user_prompt_layout():
+    prompt = ai_engine._build_user_prompt("R", "J", "", "Return JSON only.")
+    assert prompt == '\nRESUME TEXT:\n"R"\n\nJOB DESCRIPTION:\n"J"\n\nReturn JSON only.\n'
+
+
+def test_concurrent_identical_extractions_share_one_call(monkeypatch):
+    release = threading.Event()
+    calls = []
+
+    def slow_create(**kwargs):
+        calls.append(kwargs)
+        release.wait(timeout=5)
+        return json.dumps(SAMPLE_EXTRACTION)
+
+    monkeypatch.setattr(ai_engine, "_create_completion", slow_create)
+    monkeypatch.setattr(ai_engine, "_lookup_extraction", lambda *args: ("same-key", None, None))
+    monkeypatch.setattr(ai_engine, "_store_extraction", lambda *args: None)
+
+    claims = []
+    claim_inflight = ai_engine._claim_inflight
+
+    def counting_claim(cache_key):
+        claimed = claim_inflight(cache_key)
+        claims.append(claimed)
+        return claimed
+
+    monkeypatch.setattr(ai_engine, "_claim_inflight", counting_claim)
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(
+            ai_engine._extract_requirements("Python developer resume", SHORT_JOB)
+        ))
+        for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while len(claims) < 3 and time.monotonic() < deadline:  # All three join before the call finishes
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert len(claims) == 3
+    assert not any(thread.is_alive() for thread in threads)
+    assert len(calls) == 1
+    assert len(results) == 3
+    assert not ai_engine._inflight
+
+
+def test_analyze_resume_rejects_unusable_input_without_calling_openai(monkeypatch):
+    def fail(*args):
+        raise AssertionError("extraction should not run")
+
+    monkeypatch.setattr(ai_engine, "_extract_requirements", fail)
+
+    assert ai_engine.analyze_resume("   ", SHORT_JOB)["error"] == "Analysis failed: Resume text too short"
+    assert ai_engine.analyze_resume(SAMPLE_RESUME, "")["interpretation"] == "ERROR"
+
+
+def test_embedding_cache_is_thread_safe_lru(monkeypatch):
+    ai_engine.clear_cache()
+    monkeypatch.setattr(ai_engine, "EMBEDDING_CACHE_MAX_ENTRIES", 8)
+    errors = []
+
+    def fill(worker):
+        try:
+            for i in range(500):
+                ai_engine._remember_embedding(f"{worker}-{i}", b"\x00")
+        except Exception as e:  # e.g. KeyError from a double eviction
+            errors.append(e)
+
+    threads = [threading.Thread(target=fill, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert len(ai_engine._embedding_cache) == 8
+
+    # A hit refreshes the entry so it outlives newer ones
+    oldest = next(iter(ai_engine._embedding_cache))
+    ai_engine._get_cached_embedding(oldest)
+    ai_engine._remember_embedding("newest", b"\x00")
+    assert oldest in ai_engine._embedding_cache
+    ai_engine.clear_cache()
+
+
+def test_semantic_index_concurrent_adds_keep_every_entry():
+    ai_engine.clear_cache()
+    vector = ai_engine.np.array([1.0, 0.0], dtype=ai_engine.np.float32)
+
+    def add(worker):
+        for i in range(50):
+            ai_engine._add_to_semantic_index(f"{worker}-{i}", vector, "gpt-4o")
+
+    threads = [threading.Thread(target=add, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    keys, vectors = ai_engine._semantic_index[ai_engine._semantic_namespace("gpt-4o")]
+    assert len(keys) == len(set(keys)) == 400
+    assert vectors.shape == (400, 2)
+    ai_engine.clear_cache()
+
+
+def test_semantic_index_load_does_not_drop_concurrent_add(monkeypatch):
+    ai_engine.clear_cache()
+    monkeypatch.setattr(ai_engine, "AI_CACHE_ENABLED", True)
+    loading = threading.Event()
+    persisted = ai_engine.np.array([0.0, 1.0], dtype=ai_engine.np.float32).tobytes()
+
+    class SlowConnection:
+        def execute(self, *args):
+            if args[0].startswith("SELECT"):
+                loading.set()
+                time.sleep(0.2)  # Give the concurrent add time to run
+            return SimpleNamespace(fetchall=lambda: [("persisted", persisted)])
+
+        def close(self):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            return False
+
+    monkeypatch.setattr(ai_engine, "_connect_persistent_cache", SlowConnection)
+    namespace = ai_engine._semantic_namespace("gpt-4o")
+    loader = threading.Thread(target=ai_engine._load_semantic_index, args=(namespace,))
+    loader.start()
+    loading.wait(timeout=5)
+    vector = ai_engine.np.array([1.0, 0.0], dtype=ai_engine.np.float32)
+    ai_engine._add_to_semantic_index("fresh", vector, "gpt-4o")
+    loader.join()
+
+    keys, _ = ai_engine._semantic_index[namespace]
+    assert keys == ["persisted", "fresh"]
+    monkeypatch.setattr(ai_engine, "AI_CACHE_ENABLED", False)
+    ai_engine.clear_cache()
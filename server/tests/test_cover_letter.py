@@ -0,0 +1,114 @@
+"""Tests for the template-based cover letter generator."""
+
+from analyzers.cover_letter import (
+    CLOSING_FNS,
+    CLOSING_TEMPLATES,
+    OPENING_FNS,
+    OPENING_TEMPLATES,
+    ToneStyle,
+    _compile_template,
+    _contains_ignore_case,
+    _extract_domain,
+    _lower_first,
+    extract_resume_data_for_cover_letter,
+    generate_cover_letter,
+)
+
+
+REQUIREMENTS = [
+    {"text": "Python", "tier": 1, "match_type": "EXACT", "evidence": "Expert in Python, Django, Flask"},
+    {"text": "AWS", "tier": 1, "match_type": "NONE", "evidence": None},
+    {"text": "Team leadership", "tier": 1, "match_type": "VARIANT", "evidence": "Led a team of 5 engineers"},
+]
+
+RESUME_DATA = {
+    "years_experience": 8,
+    "current_company": "Tech Corp",
+    "achievements": [
+        "Reduced deployment time by 60% through CI/CD automation",
+        "Led team of 5 engineers to deliver $2M project on time",
+    ],
+}
+
+
+def test_compiled_templates_match_str_format():
+    kwargs = {"job_title": "Data Analyst", "company": "O'Brien & Co", "years": 4, "domain": "data analytics"}
+    for templates, fns in ((OPENING_TEMPLATES, OPENING_FNS), (CLOSING_TEMPLATES, CLOSING_FNS)):
+        for tone in ToneStyle:
+            for src, fn in zip(templates[tone], fns[tone]):
+                assert fn(**kwargs) == src.format(**kwargs)
+
+
+def test_compile_template_without_placeholders():
+    assert _compile_template("Thanks for your time!")(company="Acme") == "Thanks for your time!"
+
+
+def test_generate_cover_letter_mentions_company_and_skills():
+    result = generate_cover_letter(
+        job_title="Senior Software Engineer",
+        company_name="Acme Technologies",
+        requirements=REQUIREMENTS,
+        resume_data=RESUME_DATA,
+        tone=ToneStyle.CONFIDENT,
+    )
+    assert "Acme Technologies" in result.full_text
+    assert result.skills_highlighted == ["Python", "Team leadership"]
+    assert [s.type for s in result.sections] == ["opening", "body", "skills", "closing"]
+
+
+def test_extract_resume_data_finds_current_company():
+    resume = (
+        "Jane Smith\n"
+        "Senior Engineer at Globex Corporation | 2019 - Present\n"
+        "- Reduced infrastructure costs by 40% in 6 months\n"
+    )
+    data = extract_resume_data_for_cover_letter(resume)
+    assert data["current_company"] == "Globex Corporation"
+
+
+def test_extract_domain_uses_priority_order():
+    # Both "data analyst" and "marketing" match; data analytics is listed first
+    assert _extract_domain("Marketing Data Analyst", []) == "data analytics"
+    assert _extract_domain("Nurse Practitioner", []) == "professional services"
+
+
+def test_lower_first_keeps_acronyms():
+    assert _lower_first("Reduced CI/CD time by 60%") == "reduced CI/CD time by 60%"
+    assert _lower_first("AWS migration for 3 teams") == "AWS migration for 3 teams"
+    assert _lower_first("") == ""
+
+
+def test_cover_letter_is_deterministic_across_processes():
+    import os
+    import subprocess
+    import sys
+
+    code = (
+        "from analyzers.cover_letter import generate_cover_letter;"
+        "print(generate_cover_letter('Engineer', 'Acme', [], "
+        "{'achievements': ['Cut p95 latency by 40% across 12 services']}).full_text)"
+    )
+    outputs = {
+        subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            capture_output=True, text=True, check=True,
+        ).stdout
+        for _ in range(3)
+    }
+    assert len(outputs) == 1
+
+
+def test_contains_ignore_case():
+    assert _contains_ignore_case("Welcome to Acme Corp.", "Acme Corp")
+    assert _contains_ignore_case("Welcome to ACME CORP.", "Acme Corp")
+    assert not _contains_ignore_case("Welcome to Globex.", "Acme Corp")
+
+
+def test_extract_resume_data_dedupes_achievements():
+    resume = (
+        "Jane Smith\n"
+        "Reduced costs by 40% in 6 months. Grew revenue by 25% and margin by 10%."
+    )
+    achievements = extract_resume_data_for_cover_letter(resume)["achievements"]
+    assert len(achievements) == len(set(achievements))
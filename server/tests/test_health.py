@@ -13,3 +13,17 @@ def test_health_includes_version(client):
     data = response.get_json()
     assert "version" in data
     assert isinstance(data["version"], str)
+
+
+def test_orjson_provider_matches_default_encoding(app):
+    import pytest
+    from datetime import datetime, timezone
+    from flask.json.provider import DefaultJSONProvider
+
+    pytest.importorskip("orjson")
+    from app import OrjsonProvider
+
+    payload = {"b": [1, 2.5, None], "a": "café", "ts": datetime(2024, 1, 2, tzinfo=timezone.utc)}
+    compact = {"separators": (",", ":")}
+    assert OrjsonProvider(app).loads(OrjsonProvider(app).dumps(payload, **compact)) == \
+        DefaultJSONProvider(app).loads(DefaultJSONProvider(app).dumps(payload, **compact))
@@ -0,0 +1,70 @@
+"""Tests for the interview question generator."""
+
+from analyzers.interview_prep import (
+    _detect_job_domain,
+    _generate_behavioral_questions,
+    _generate_technical_questions,
+    format_interview_prep,
+    generate_interview_questions,
+)
+
+
+def test_detect_job_domain_uses_priority_order():
+    # "sql" (data analytics) and "marketing" both appear; data analytics is listed first
+    reqs = [{"text": "SQL"}, {"text": "Campaign reporting"}]
+    assert _detect_job_domain("Marketing Analyst", reqs) == "data_analytics"
+    assert _detect_job_domain("Operations Manager", [{"text": "Budgeting"}]) == "general"
+
+
+def test_technical_questions_only_add_placeholder_free_generic_questions():
+    reqs = [{"text": "Python", "match_type": "EXACT"}]
+    for domain in ("software_engineering", "project_management", "unknown"):
+        for q in _generate_technical_questions(reqs, domain):
+            assert "{" not in q.question and "}" not in q.question
+    # Both leading software patterns have placeholders, so only the skill question remains
+    assert len(_generate_technical_questions(reqs, "software_engineering")) == 1
+
+
+def test_format_interview_prep_groups_and_counts_in_one_pass():
+    result = generate_interview_questions(
+        job_title="Senior Software Engineer",
+        requirements=[{"text": "Python", "tier": 1, "match_type": "EXACT", "evidence": "Built Django APIs"}],
+        gaps=[{"requirement": "Kubernetes"}],
+        num_questions=10,
+    )
+    formatted = format_interview_prep(result)
+    assert len(formatted["all_questions"]) == result.question_count
+    assert sum(formatted["difficulty_breakdown"].values()) == result.question_count
+    assert sum(len(qs) for qs in formatted["questions_by_category"].values()) == result.question_count
+    assert all("category" not in q for qs in formatted["questions_by_category"].values() for q in qs)
+
+
+def test_behavioral_questions_detect_level_by_substring():
+    leadership = "Describe your leadership style."
+    assert any(q.question == leadership for q in _generate_behavioral_questions("Team Leader", "general"))
+    assert any(q.question == leadership for q in _generate_behavioral_questions("SVP, Operations", "general"))
+    assert not any(q.question == leadership for q in _generate_behavioral_questions("Analyst", "general"))
+
+
+def test_categories_covered_follow_question_order():
+    result = generate_interview_questions(
+        job_title="Data Analyst",
+        requirements=[{"text": "SQL", "tier": 1, "match_type": "EXACT", "evidence": "Wrote SQL reports"}],
+        gaps=[{"requirement": "Tableau"}],
+    )
+    assert result.categories_covered == list(dict.fromkeys(q.category for q in result.questions))
+    assert result.categories_covered[0] == "gap_based"
+
+
+def test_general_questions_top_up_to_requested_count():
+    for n in (1, 14, 30):
+        result = generate_interview_questions(job_title="Analyst", requirements=[], gaps=[], num_questions=n)
+        assert result.question_count == n
+
+
+def test_technical_questions_fill_only_skill_placeholders():
+    reqs = [{"text": "Kafka", "match_type": "EXACT"}] * 5
+    for domain in ("software_engineering", "data_analytics", "marketing"):
+        for q in _generate_technical_questions(reqs, domain):
+            assert q.question.count("Kafka") <= 1
+            assert "{" not in q.question
@@ -0,0 +1,47 @@
+"""Tests for the resume quality analyzer."""
+
+from analyzers import resume_quality
+from analyzers.resume_quality import (
+    analyze_resume_quality,
+    clear_quality_cache,
+    format_quality_report,
+)
+
+
+RESUME = """Jane Smith
+jane.smith@example.com | (555) 123-4567
+
+EXPERIENCE
+• Led migration of 12 services to AWS, cutting costs by 35%
+• Managed $1.2M budget across 4 projects
+
+SKILLS
+Python, Django, PostgreSQL
+"""
+
+
+def test_repeat_analysis_is_served_from_cache():
+    clear_quality_cache()
+    first = analyze_resume_quality(RESUME)
+    assert analyze_resume_quality(RESUME) is first
+    assert analyze_resume_quality(RESUME + "\nEDUCATION") is not first
+    clear_quality_cache()
+    assert analyze_resume_quality(RESUME) is not first
+
+
+def test_quality_cache_evicts_least_recently_used(monkeypatch):
+    clear_quality_cache()
+    monkeypatch.setattr(resume_quality, "QUALITY_CACHE_MAX_ENTRIES", 2)
+    first = analyze_resume_quality("resume one")
+    analyze_resume_quality("resume two")
+    analyze_resume_quality("resume one")  # Refresh so "two" is the oldest
+    analyze_resume_quality("resume three")
+    assert len(resume_quality._quality_cache) == 2
+    assert analyze_resume_quality("resume one") is first
+    clear_quality_cache()
+
+
+def test_top_suggestions_capped_at_five():
+    report = format_quality_report(analyze_resume_quality("x"))
+    assert len(report["top_suggestions"]) == 5
+    assert report["top_suggestions"][0]["category"] == "Quantified Achievements"
@@ -0,0 +1,13 @@
+"""Tests for the role fit analyzer."""
+
+from analyzers.role_fit import detect_role_level
+
+
+def test_detect_role_level_checks_levels_in_order():
+    # "Senior" and "Engineer" both match; senior is checked before mid
+    assert detect_role_level("Senior Software Engineer") == "senior"
+    assert detect_role_level("VP of Engineering") == "executive"
+    assert detect_role_level("Head of Data") == "director"
+    assert detect_role_level("Marketing Coordinator") == "mid"
+    assert detect_role_level("Software Engineering Intern") == "entry"
+    assert detect_role_level("Barista") == "mid"
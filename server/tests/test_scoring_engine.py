@@ -3,7 +3,12 @@
 These are the highest-value tests — pure logic with no network calls.
 """
 
-from scoring_engine import calculate_score, ScoreInterpretation
+from scoring_engine import (
+    calculate_score,
+    format_evaluation,
+    generate_evaluation,
+    ScoreInterpretation,
+)
 
 
 def _make_req(text, tier, match_type, evidence=None):
@@ -112,3 +117,25 @@ def test_score_interpretation_bands():
     reqs_none = [_make_req("X", 1, "NONE") for _ in range(5)]
     result_none = calculate_score(reqs_none, required_years=5, candidate_years=5)
     assert result_none.interpretation == ScoreInterpretation.POOR_FIT.value
+
+
+def test_format_evaluation_nests_fields_for_frontend():
+    tier_scores = {
+        1: {"total": 2, "matched": 2, "details": []},
+        2: {"total": 1, "matched": 1, "details": []},
+        3: {"total": 0, "matched": 0, "details": []},
+    }
+    evaluation = generate_evaluation(
+        score=85,
+        tier_scores=tier_scores,
+        missing_critical=[],
+        matched_critical=["Python", "SQL"],
+        weak_matches=[],
+        experience_ratio=1.0,
+    )
+    formatted = format_evaluation(evaluation)
+
+    assert formatted["hiring"]["status"] == evaluation.hiring_status
+    assert formatted["search"]["matched"] == evaluation.search_matched
+    assert formatted["roleMisalignment"]["detected"] == evaluation.has_role_misalignment
+    assert formatted["verdict"]["ready_to_submit"] == evaluation.ready_to_submit
@@ -0,0 +1,78 @@
+"""Tests for the shared text analysis utilities."""
+
+import pytest
+
+from utils import text_analysis
+from utils.text_analysis import (
+    analyze_action_verbs,
+    extract_email,
+    extract_metrics,
+    extract_metrics_simple,
+    extract_name,
+    extract_phone,
+    extract_skills_section,
+    get_text_stats,
+    scan_resume,
+)
+
+
+RESUME = """Jane Smith
+jane.smith@example.com | (555) 123-4567
+
+EXPERIENCE
+Senior Engineer, Globex | 2019 - Present
+• Led migration of 12 services to AWS, cutting costs by 35%
+• Managed $1.2M budget across 4 projects. Increased throughput 3x faster
+- Helped onboard 200+ users in 6 months
+
+EDUCATION
+B.S. Computer Science
+
+SKILLS
+Python, Django, PostgreSQL, Docker
+"""
+
+
+def test_scan_resume_matches_individual_extractors():
+    scan = scan_resume(RESUME)
+    assert scan.metrics == extract_metrics(RESUME)
+    assert scan.verb_analysis == analyze_action_verbs(RESUME)
+    assert scan.text_stats == get_text_stats(RESUME)
+    assert scan.skills == extract_skills_section(RESUME)
+    assert scan.name == extract_name(RESUME)
+    assert scan.email == extract_email(RESUME)
+    assert scan.phone == extract_phone(RESUME)
+    assert (scan.has_experience, scan.has_education, scan.has_skills) == (True, True, True)
+
+
+def test_scan_resume_metric_types_match_simple_extractor():
+    by_type = scan_resume(RESUME).metrics_by_type
+    assert set(by_type) == set(extract_metrics_simple(RESUME))
+
+
+def test_verb_automaton_matches_substring_scan(monkeypatch):
+    pytest.importorskip("ahocorasick")
+    text = RESUME.lower() + " mishandled; co-led; was responsible for"
+    with_automaton = text_analysis._find_verbs(text)
+    monkeypatch.setattr(text_analysis, "_VERB_AUTOMATON", None)
+    assert with_automaton == text_analysis._find_verbs(text)
+
+
+def test_text_stats_counts_bullets_and_headers():
+    text = "SUMMARY\nWork History:\n## Projects\n  • Built APIs\n- Led team\n1. Shipped v2\na) Cut costs\nplain line"
+    stats = get_text_stats(text)
+    assert stats.bullet_count == 4
+    assert stats.section_count == 3
+
+
+def test_extract_name_only_checks_first_five_lines():
+    assert extract_name("\n  Jane Smith\nEngineer") == "Jane Smith"
+    assert extract_name("a\nb\nc\nd\ne\nJane Smith") is None
+    assert extract_name("555-123-4567 Jane Smith\nJANE SMITH") == "JANE SMITH"
+
+
+def test_extract_skills_section_header_case_folding():
+    assert extract_skills_section("Summary\nTechnical Skills: Python, Go\n\nEDUCATION") == ["Python", "Go"]
+    # re.IGNORECASE matches the long s in the header; str.lower() does not
+    assert extract_skills_section("ſkills: Python, Go") == ["Python", "Go"]
+    assert extract_skills_section("No header here") == []
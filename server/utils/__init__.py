@@ -9,6 +9,7 @@ from .text_analysis import (
     MetricMatch,
     VerbAnalysis,
     TextStats,
+    ResumeScan,
     
     # Constants
     POWER_VERBS,
@@ -27,6 +28,7 @@ from .text_analysis import (
     extract_phone,
     extract_name,
     extract_skills_section,
+    scan_resume,
     
     # Comparison utilities
     find_keyword_in_text,
@@ -41,6 +43,7 @@ __all__ = [
     "MetricMatch",
     "VerbAnalysis", 
     "TextStats",
+    "ResumeScan",
     "POWER_VERBS",
     "ALL_POWER_VERBS",
     "WEAK_VERBS",
@@ -55,6 +58,7 @@ __all__ = [
     "extract_phone",
     "extract_name",
     "extract_skills_section",
+    "scan_resume",
     "find_keyword_in_text",
     "calculate_keyword_density",
     "clean_text",
@@ -11,12 +11,18 @@ import re
 from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional, Tuple
 
+# pyahocorasick is an optional, faster multi-substring matcher for verb scans
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - depends on the environment
+    ahocorasick = None
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # DATA CLASSES
 # ═══════════════════════════════════════════════════════════════════════════
 
-@dataclass
+@dataclass(slots=True)
 class MetricMatch:
     """A quantified achievement found in text."""
     text: str           # The matched text (e.g., "35%")
@@ -25,7 +31,7 @@ class MetricMatch:
     value: Optional[float] = None  # Extracted numeric value
 
 
-@dataclass
+@dataclass(slots=True)
 class VerbAnalysis:
     """Analysis of action verbs in text."""
     power_verbs: List[str]
@@ -35,7 +41,7 @@ class VerbAnalysis:
     verb_categories: Dict[str, int] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class TextStats:
     """Basic text statistics."""
     word_count: int
@@ -45,6 +51,22 @@ class TextStats:
     avg_sentence_length: float
 
 
+@dataclass(slots=True)
+class ResumeScan:
+    """Everything the resume quality analyzer extracts, from one scan."""
+    metrics: List[MetricMatch]
+    metrics_by_type: Dict[str, List[str]]  # Metric texts grouped by type
+    verb_analysis: VerbAnalysis
+    text_stats: TextStats
+    skills: List[str]
+    name: Optional[str]
+    email: Optional[str]
+    phone: Optional[str]
+    has_experience: bool  # Mentions "experience"
+    has_education: bool   # Mentions "education"
+    has_skills: bool      # Mentions "skills" or "technologies"
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # CONSTANTS
 # ═══════════════════════════════════════════════════════════════════════════
@@ -66,6 +88,22 @@ WEAK_VERBS = [
     "dealt with", "participated in", "involved in", "did", "made",
 ]
 
+_ALL_VERBS = tuple(dict.fromkeys(ALL_POWER_VERBS + WEAK_VERBS))
+
+
+def _build_verb_automaton():
+    """One Aho-Corasick automaton over every power and weak verb, if available."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for verb in _ALL_VERBS:
+        automaton.add_word(verb, verb)
+    automaton.make_automaton()
+    return automaton
+
+
+_VERB_AUTOMATON = _build_verb_automaton()
+
 METRIC_PATTERNS = [
     (r'\d+%', "percentage"),
     (r'\$[\d,]+(?:\.\d{2})?(?:[KMB])?', "dollar_amount"),
@@ -76,6 +114,12 @@ METRIC_PATTERNS = [
     (r'\d+\+?\s*(?:years?|months?|weeks?)', "time_period"),
 ]
 
+_METRIC_REGEXES = [
+    (re.compile(pattern, re.IGNORECASE), metric_type)
+    for pattern, metric_type in METRIC_PATTERNS
+]
+_METRIC_VALUE_RE = re.compile(r'[\d,]+(?:\.\d+)?')
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # METRIC EXTRACTION
@@ -91,16 +135,20 @@ def extract_metrics(text: str) -> List[MetricMatch]:
     Returns:
         List of MetricMatch objects with context
     """
+    return _extract_metrics_from_sentences(split_into_sentences(text))
+
+
+def _extract_metrics_from_sentences(sentences: List[str]) -> List[MetricMatch]:
+    """extract_metrics() over already-split sentences."""
     metrics = []
-    sentences = split_into_sentences(text)
     
     for sentence in sentences:
-        for pattern, metric_type in METRIC_PATTERNS:
-            matches = re.finditer(pattern, sentence, re.IGNORECASE)
+        for pattern, metric_type in _METRIC_REGEXES:
+            matches = pattern.finditer(sentence)
             for match in matches:
                 # Extract numeric value if possible
                 value = None
-                num_match = re.search(r'[\d,]+(?:\.\d+)?', match.group())
+                num_match = _METRIC_VALUE_RE.search(match.group())
                 if num_match:
                     try:
                         value = float(num_match.group().replace(',', ''))
@@ -145,6 +193,14 @@ def extract_metrics_simple(text: str) -> Dict[str, List[str]]:
     return result
 
 
+def _group_metrics_by_type(metrics: List[MetricMatch]) -> Dict[str, List[str]]:
+    """Group metric texts by type (same keys as extract_metrics_simple)."""
+    result: Dict[str, List[str]] = {}
+    for m in metrics:
+        result.setdefault(m.type, []).append(m.text)
+    return result
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # ACTION VERB ANALYSIS
 # ═══════════════════════════════════════════════════════════════════════════
@@ -159,20 +215,24 @@ def analyze_action_verbs(text: str) -> VerbAnalysis:
     Returns:
         VerbAnalysis with power/weak verb breakdown
     """
-    text_lower = text.lower()
-    
+    return _analyze_action_verbs_lower(text.lower())
+
+
+def _analyze_action_verbs_lower(text_lower: str) -> VerbAnalysis:
+    """analyze_action_verbs() over already lower-cased text."""
+    found = _find_verbs(text_lower)
     power_found = []
     categories: Dict[str, int] = {}
     
     for category, verbs in POWER_VERBS.items():
         category_count = 0
         for verb in verbs:
-            if verb in text_lower:
+            if verb in found:
                 power_found.append(verb)
                 category_count += 1
         categories[category] = category_count
     
-    weak_found = [verb for verb in WEAK_VERBS if verb in text_lower]
+    weak_found = [verb for verb in WEAK_VERBS if verb in found]
     
     return VerbAnalysis(
         power_verbs=list(set(power_found)),
@@ -183,10 +243,29 @@ def analyze_action_verbs(text: str) -> VerbAnalysis:
     )
 
 
+def _find_verbs(text_lower: str) -> set:
+    """Power and weak verbs that occur anywhere in text_lower (substring match)."""
+    if _VERB_AUTOMATON is not None:
+        # One pass over the text instead of one substring search per verb
+        return {verb for _, verb in _VERB_AUTOMATON.iter(text_lower)}
+    return {verb for verb in _ALL_VERBS if verb in text_lower}
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # TEXT STATISTICS
 # ═══════════════════════════════════════════════════════════════════════════
 
+# Line starts that count as bullet points
+_BULLET_RE = re.compile(r'[\•\-\*\→\►]|\d+\.|[a-z]\)')
+
+# Lines that look like section headers
+_SECTION_HEADER_RE = re.compile(
+    r'[A-Z][A-Z\s]+$'  # ALL CAPS
+    r'|[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s*:?\s*$'  # Title Case
+    r'|#+\s+'  # Markdown headers
+)
+
+
 def get_text_stats(text: str) -> TextStats:
     """
     Get basic statistics about text.
@@ -197,33 +276,21 @@ def get_text_stats(text: str) -> TextStats:
     Returns:
         TextStats with counts and averages
     """
+    return _get_text_stats(text, split_into_sentences(text), text.split('\n'))
+
+
+def _get_text_stats(text: str, sentences: List[str], lines: List[str]) -> TextStats:
+    """get_text_stats() with the sentences and lines already split."""
     words = text.split()
-    sentences = split_into_sentences(text)
     
-    # Count bullet points
-    bullet_patterns = [r'^[\•\-\*\→\►]', r'^\d+\.', r'^[a-z]\)']
     bullet_count = 0
-    for line in text.split('\n'):
-        line = line.strip()
-        for pattern in bullet_patterns:
-            if re.match(pattern, line):
-                bullet_count += 1
-                break
-    
-    # Count sections (lines that look like headers)
-    section_patterns = [
-        r'^[A-Z][A-Z\s]+$',  # ALL CAPS
-        r'^[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s*:?\s*$',  # Title Case
-        r'^#+\s+',  # Markdown headers
-    ]
     section_count = 0
-    for line in text.split('\n'):
+    for line in lines:
         line = line.strip()
-        if len(line) > 2 and len(line) < 50:
-            for pattern in section_patterns:
-                if re.match(pattern, line):
-                    section_count += 1
-                    break
+        if _BULLET_RE.match(line):
+            bullet_count += 1
+        if len(line) > 2 and len(line) < 50 and _SECTION_HEADER_RE.match(line):
+            section_count += 1
     
     avg_sentence_length = len(words) / len(sentences) if sentences else 0
     
@@ -247,21 +314,27 @@ def split_into_sentences(text: str) -> List[str]:
 # CONTACT INFO EXTRACTION
 # ═══════════════════════════════════════════════════════════════════════════
 
+_EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+
+_PHONE_RES = [
+    re.compile(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'),
+    re.compile(r'\+\d{1,3}[-.\s]?\d{3}[-.\s]?\d{3}[-.\s]?\d{4}'),
+]
+
+# Lines containing something phone-like are not the name
+_NAME_SKIP_RE = re.compile(r'\d{3}[-.\s]?\d{3}')
+
+
 def extract_email(text: str) -> Optional[str]:
     """Extract email address from text."""
-    pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-    match = re.search(pattern, text)
+    match = _EMAIL_RE.search(text)
     return match.group() if match else None
 
 
 def extract_phone(text: str) -> Optional[str]:
     """Extract phone number from text."""
-    patterns = [
-        r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',
-        r'\+\d{1,3}[-.\s]?\d{3}[-.\s]?\d{3}[-.\s]?\d{4}',
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text)
+    for pattern in _PHONE_RES:
+        match = pattern.search(text)
         if match:
             return match.group()
     return None
@@ -269,11 +342,11 @@ def extract_phone(text: str) -> Optional[str]:
 
 def extract_name(text: str) -> Optional[str]:
     """Extract candidate name from resume (usually first line)."""
-    lines = text.strip().split('\n')
+    lines = text.strip().split('\n', 5)  # Only the head is needed
     for line in lines[:5]:  # Check first 5 lines
         line = line.strip()
         # Skip empty lines, emails, phone numbers
-        if not line or '@' in line or re.search(r'\d{3}[-.\s]?\d{3}', line):
+        if not line or '@' in line or _NAME_SKIP_RE.search(line):
             continue
         # Name is usually short, title case or all caps
         if 2 <= len(line.split()) <= 4 and len(line) < 50:
@@ -296,13 +369,36 @@ def extract_years_of_experience(text: str) -> Optional[int]:
     return None
 
 
+_SKILLS_SECTION_RE = re.compile(
+    r'(?:SKILLS|TECHNOLOGIES|TECHNICAL SKILLS|CORE COMPETENCIES)[:\s]*\n?(.*?)(?:\n\n|\n[A-Z]|$)',
+    re.IGNORECASE | re.DOTALL,
+)
+_SKILLS_HEADERS = ("skills", "technologies", "technical skills", "core competencies")
+
+# Characters re.IGNORECASE equates with a header letter that str.lower() does
+# not map to it (dotted/dotless i, long s, Kelvin sign)
+_IGNORECASE_ONLY_CHARS = ("\u0130", "\u0131", "\u017f", "\u212a")
+
+
 def extract_skills_section(text: str) -> List[str]:
     """Extract skills from a skills section."""
+    return _extract_skills_section(text, text.lower())
+
+
+def _extract_skills_section(text: str, text_lower: str) -> List[str]:
+    """extract_skills_section() with the lower-cased text already computed."""
     skills = []
     
-    # Find skills section
-    skills_pattern = r'(?:SKILLS|TECHNOLOGIES|TECHNICAL SKILLS|CORE COMPETENCIES)[:\s]*\n?(.*?)(?:\n\n|\n[A-Z]|$)'
-    match = re.search(skills_pattern, text, re.IGNORECASE | re.DOTALL)
+    # Find skills section. Start the regex at the first header so it doesn't
+    # try the header alternation at every earlier position. Finding headers
+    # in text_lower is exact unless one of the chars above is present.
+    start = 0
+    if not any(c in text for c in _IGNORECASE_ONLY_CHARS):
+        starts = [i for i in map(text_lower.find, _SKILLS_HEADERS) if i >= 0]
+        if not starts:
+            return skills
+        start = min(starts)
+    match = _SKILLS_SECTION_RE.search(text, start)
     
     if match:
         skills_text = match.group(1)
@@ -313,6 +409,44 @@ def extract_skills_section(text: str) -> List[str]:
     return skills[:20]  # Limit to 20 skills
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+# RESUME SCAN
+# ═══════════════════════════════════════════════════════════════════════════
+
+def scan_resume(text: str) -> ResumeScan:
+    """
+    Run every extractor the quality analyzer needs over one resume.
+    
+    Splits sentences and lines and lower-cases the text once, and shares them
+    across the extractors instead of each re-deriving its own copy. Metric
+    texts by type come from the sentence-level metrics rather than a second
+    full-text pass.
+    
+    Args:
+        text: Resume text
+        
+    Returns:
+        ResumeScan with metrics, verbs, stats, skills and contact info
+    """
+    text_lower = text.lower()
+    sentences = split_into_sentences(text)
+    metrics = _extract_metrics_from_sentences(sentences)
+    
+    return ResumeScan(
+        metrics=metrics,
+        metrics_by_type=_group_metrics_by_type(metrics),
+        verb_analysis=_analyze_action_verbs_lower(text_lower),
+        text_stats=_get_text_stats(text, sentences, text.split('\n')),
+        skills=_extract_skills_section(text, text_lower),
+        name=extract_name(text),
+        email=extract_email(text),
+        phone=extract_phone(text),
+        has_experience="experience" in text_lower,
+        has_education="education" in text_lower,
+        has_skills="skills" in text_lower or "technologies" in text_lower,
+    )
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # KEYWORD UTILITIES
 # ═══════════════════════════════════════════════════════════════════════════